@@ -1,4 +1,4 @@
-from .clustering import cluster
+from .clustering import cluster, cluster_many, cluster_parallel
 from .embeddings import (
     aac,
     blosum62,
@@ -24,6 +24,8 @@ __all__ = [
     "clean",
     "split",
     "cluster",
+    "cluster_many",
+    "cluster_parallel",
     "train_test_cluster_split",
     "train_test_val_cluster_split",
     "constrained_split",
@@ -1,12 +1,254 @@
+import atexit
+import contextlib
+import csv
+import hashlib
 import logging
 import os
 import shutil
 import subprocess
 import tempfile
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 
 from .logger import logger
 from .utils import _check_mmseqs, _validate_clustering_params, check_random_state
 
+# Number of FASTA records encoded per write; bounds the size of the intermediate buffers
+_FASTA_CHUNK_SIZE = 100_000
+
+# File buffer size for MMseqs2 input/output; large buffers keep the syscall count low
+_IO_BUFFER_SIZE = 1 << 22
+
+# Inputs at least this large parse the cluster TSV while MMseqs2 cleans up
+_OVERLAP_MIN_SEQUENCES = 100_000
+_OVERLAP_POLL_INTERVAL = 0.1
+
+# FASTA headers end at the first space, so spaces in IDs are replaced
+_SPACE_TO_UNDERSCORE = str.maketrans(" ", "_")
+
+# Prefilter sensitivity used by sensitivity="auto": (minimum identity, -s), highest first.
+# Near-identical sequences are found at -s 1, remote homologs need -s 6 or more.
+_AUTO_SENSITIVITY = ((0.9, 1.0), (0.5, 3.5), (0.0, 6.0))
+
+# MMseqs2 sequence databases reused by cluster(..., reuse_db=True), keyed by input content
+# and kept in least-recently-used order. At most _DB_CACHE_SIZE idle databases are kept;
+# the rest are removed as soon as no clustering run is using them, and all are removed at exit.
+_DB_CACHE_DIR_NAME = "protclust_cache"
+_DB_CACHE_SIZE = 4
+_db_cache = OrderedDict()
+_db_cache_users = Counter()
+_db_cache_lock = threading.Lock()
+
+
+def _write_fasta(path, ids, sequences, chunk_size=_FASTA_CHUNK_SIZE):
+    """
+    Writes IDs and sequences to a FASTA file in vectorized chunks.
+
+    Each chunk is assembled with pandas string ops and written with a single call,
+    so peak memory stays proportional to the chunk rather than the whole dataset.
+
+    Parameters:
+        path (str): Output FASTA path.
+        ids (pd.Series): Record identifiers (written after '>').
+        sequences (pd.Series): Sequences aligned with ids.
+    """
+    ids = ids.astype(str)
+    sequences = sequences.astype(str)
+    with open(path, "wb", buffering=_IO_BUFFER_SIZE) as fasta_file:
+        for start in range(0, len(ids), chunk_size):
+            stop = start + chunk_size
+            chunk = (
+                ">" + ids.iloc[start:stop] + "\n" + sequences.iloc[start:stop] + "\n"
+            ).str.cat()
+            fasta_file.write(chunk.encode("utf-8"))
+
+
+def _read_cluster_tsv(clusters_file):
+    """
+    Reads the MMseqs2 '_cluster.tsv' file.
+
+    Parameters:
+        clusters_file (str): Path to the cluster TSV.
+
+    Returns:
+        pd.DataFrame: Columns 'rep' (representative ID) and 'seq' (member ID).
+    """
+    if not os.path.exists(clusters_file):
+        logger.error("MMseqs2 clustering results file not found")
+        raise FileNotFoundError("MMseqs2 clustering results not found.")
+
+    logger.debug(f"Reading clustering results from {clusters_file}")
+
+    # Parse with the pandas C tokenizer; IDs are kept verbatim (no NA or quote handling)
+    with open(clusters_file, "rb", buffering=_IO_BUFFER_SIZE) as f:
+        return pd.read_csv(
+            f,
+            sep="\t",
+            header=None,
+            names=["rep", "seq"],
+            dtype=str,
+            engine="c",
+            keep_default_na=False,
+            na_filter=False,
+            quoting=csv.QUOTE_NONE,
+        )
+
+
+def _run_mmseqs(mmseqs_cmd):
+    """
+    Runs an MMseqs2 command, showing its output only at DEBUG verbosity.
+
+    Parameters:
+        mmseqs_cmd (list): MMseqs2 command line.
+
+    Raises:
+        subprocess.CalledProcessError: If MMseqs2 exits with a non-zero status.
+    """
+    logger.debug(f"Running MMseqs2 command: {' '.join(mmseqs_cmd)}")
+    if logger.level <= logging.DEBUG:
+        subprocess.run(mmseqs_cmd, check=True)
+    else:
+        subprocess.run(
+            mmseqs_cmd,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+def _evict_db_cache():
+    """
+    Removes least recently used idle databases until at most _DB_CACHE_SIZE remain.
+
+    Must be called with _db_cache_lock held. Databases in use by a running cluster() call
+    are skipped and removed by a later eviction once released.
+    """
+    for key in list(_db_cache):
+        if len(_db_cache) <= _DB_CACHE_SIZE:
+            break
+        if _db_cache_users[key]:
+            continue
+        sequence_db = _db_cache.pop(key)
+        logger.debug(f"Evicting MMseqs2 sequence database {sequence_db}")
+        shutil.rmtree(os.path.dirname(sequence_db), ignore_errors=True)
+
+
+@contextlib.contextmanager
+def _cached_sequence_db(ids, sequences, createdb_options, cache_parent=None):
+    """
+    Provides an MMseqs2 sequence database for the given records, creating it on first use.
+
+    Databases are keyed by a hash of the records, the createdb options and the cache
+    location, so repeated clustering of the same input (parameter sweeps, repeated splits)
+    skips createdb. The database is protected from eviction until the context exits.
+
+    Parameters:
+        ids (pd.Series): Sanitized record identifiers.
+        sequences (pd.Series): Sequences aligned with ids.
+        createdb_options (list): Extra 'mmseqs createdb' arguments.
+        cache_parent (str): Directory holding the cache (default None: system temp
+            directory).
+
+    Yields:
+        str: Path of the sequence database.
+    """
+    cache_dir = os.path.join(cache_parent or tempfile.gettempdir(), _DB_CACHE_DIR_NAME)
+
+    records = pd.DataFrame({"id": ids.to_numpy(), "sequence": sequences.to_numpy()})
+    digest = hashlib.sha256(pd.util.hash_pandas_object(records, index=False).to_numpy().tobytes())
+    digest.update(" ".join(createdb_options).encode("utf-8"))
+    digest.update(os.path.abspath(cache_dir).encode("utf-8"))
+    key = digest.hexdigest()
+
+    with _db_cache_lock:
+        sequence_db = _db_cache.get(key)
+        if sequence_db is not None and os.path.exists(sequence_db):
+            logger.debug(f"Reusing MMseqs2 sequence database {sequence_db}")
+            _db_cache.move_to_end(key)
+        else:
+            os.makedirs(cache_dir, exist_ok=True)
+            db_dir = tempfile.mkdtemp(prefix="db_", dir=cache_dir)
+            try:
+                input_fasta = os.path.join(db_dir, "input.fasta")
+                _write_fasta(input_fasta, ids, sequences)
+                sequence_db = os.path.join(db_dir, "sequenceDB")
+                _run_mmseqs(["mmseqs", "createdb", input_fasta, sequence_db] + createdb_options)
+            except BaseException:
+                shutil.rmtree(db_dir, ignore_errors=True)
+                raise
+
+            logger.debug(f"Created MMseqs2 sequence database {sequence_db}")
+            _db_cache[key] = sequence_db
+        _db_cache_users[key] += 1
+        _evict_db_cache()
+
+    try:
+        yield sequence_db
+    finally:
+        with _db_cache_lock:
+            _db_cache_users[key] -= 1
+            if not _db_cache_users[key]:
+                del _db_cache_users[key]
+            _evict_db_cache()
+
+
+@atexit.register
+def _clear_db_cache():
+    """Removes all cached MMseqs2 sequence databases."""
+    with _db_cache_lock:
+        for sequence_db in _db_cache.values():
+            shutil.rmtree(os.path.dirname(sequence_db), ignore_errors=True)
+        _db_cache.clear()
+
+
+def _run_mmseqs_overlapped(mmseqs_cmd, clusters_file):
+    """
+    Runs MMseqs2 and parses the cluster TSV while MMseqs2 is still finishing up.
+
+    easy-cluster and easy-linclust build all outputs in their temporary directory and
+    move '_cluster.tsv' into place last, after the FASTA files. Once it exists the TSV is
+    complete, so it is parsed in a background thread while MMseqs2 removes its temporary
+    databases.
+
+    Parameters:
+        mmseqs_cmd (list): MMseqs2 command line.
+        clusters_file (str): Path of the '_cluster.tsv' MMseqs2 will write.
+
+    Returns:
+        pd.DataFrame: Parsed cluster TSV (see _read_cluster_tsv).
+
+    Raises:
+        subprocess.CalledProcessError: If MMseqs2 exits with a non-zero status.
+    """
+    output = None if logger.level <= logging.DEBUG else subprocess.DEVNULL
+
+    process = subprocess.Popen(mmseqs_cmd, stdout=output, stderr=output)
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            parse_future = None
+            while True:
+                try:
+                    process.wait(timeout=_OVERLAP_POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    if parse_future is None and os.path.exists(clusters_file):
+                        logger.debug("Cluster TSV complete, parsing while MMseqs2 finishes")
+                        parse_future = executor.submit(_read_cluster_tsv, clusters_file)
+
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, mmseqs_cmd)
+
+            if parse_future is None:
+                return _read_cluster_tsv(clusters_file)
+            return parse_future.result()
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
 
 def cluster(
     df,
@@ -19,6 +261,14 @@ def cluster(
     cluster_mode=0,
     cluster_steps=1,
     random_state=None,
+    threads=None,
+    sensitivity=None,
+    tmp_dir=None,
+    algorithm="cluster",
+    reuse_db=False,
+    max_seqs=None,
+    max_accept=None,
+    max_rejected=None,
 ):
     """
     Clusters sequences with MMseqs2 and adds a 'representative_sequence' column.
@@ -45,7 +295,29 @@ def cluster(
             2: greedy incremental
         cluster_steps (int): Number of clustering steps (default 1)
         random_state (None, int, or RandomState): Random seed for MMseqs2 (default None).
-        threads (int): Number of threads to use (default 1). threads > 1 impacts reproducibility.
+        threads (int): Number of MMseqs2 threads (default None: 1 if random_state is given,
+            otherwise all available CPUs). threads > 1 impacts reproducibility.
+        sensitivity (float or str): MMseqs2 prefilter sensitivity '-s' (default None: MMseqs2
+            default). Lower values are faster, higher values find more remote homologs.
+            "auto" picks it from min_seq_id: 1.0 for >= 0.9, 3.5 for >= 0.5, 6.0 otherwise.
+        tmp_dir (str): Parent directory for MMseqs2 scratch files (default None: system
+            temp directory). A tmpfs location such as '/dev/shm' can speed up large runs.
+        algorithm (str): MMseqs2 clustering workflow (default "cluster"):
+            "cluster": easy-cluster, the most sensitive option
+            "linclust": easy-linclust, linear time and much lower memory for large datasets
+                at a small cost in recall (cluster_steps and sensitivity do not apply)
+        reuse_db (bool): Cache the MMseqs2 sequence database and reuse it when the same
+            sequences and IDs are clustered again (default False). The few most recently
+            used databases are kept under tmp_dir (or the system temp directory) until exit.
+        max_seqs (int): Maximum prefilter hits per sequence '--max-seqs' (default None: MMseqs2
+            default). Not used by linclust.
+        max_accept (int): Stop aligning a sequence after this many accepted alignments
+            '--max-accept' (default None: no limit).
+        max_rejected (int): Stop aligning a sequence after this many rejected alignments
+            '--max-rejected' (default None: no limit).
+            At high identity (min_seq_id >= 0.9), sensitivity="auto" with max_rejected=5
+            typically gives the same clusters several times faster. A max_accept as low as 1
+            stops at the self-hit and leaves most sequences as singletons.
 
     Returns:
         pd.DataFrame: Original DataFrame with a new 'representative_sequence' column.
@@ -54,13 +326,46 @@ def cluster(
     logger.info(
         f"Parameters: min_seq_id={min_seq_id}, coverage={coverage}, cov_mode={cov_mode}, "
         f"alignment_mode={alignment_mode}, cluster_mode={cluster_mode}, cluster_steps={cluster_steps}, "
-        f"random_state={random_state}"
+        f"random_state={random_state}, threads={threads}, sensitivity={sensitivity}, "
+        f"algorithm={algorithm}, reuse_db={reuse_db}, max_seqs={max_seqs}, "
+        f"max_accept={max_accept}, max_rejected={max_rejected}"
     )
 
     _check_mmseqs()
     _validate_clustering_params(
         min_seq_id, coverage, cov_mode, alignment_mode, cluster_mode, cluster_steps
     )
+    if threads is not None and (not isinstance(threads, int) or threads <= 0):
+        raise ValueError(f"threads must be a positive integer, got {threads}")
+    if algorithm not in ("cluster", "linclust"):
+        raise ValueError(f"algorithm must be 'cluster' or 'linclust', got {algorithm}")
+    if sensitivity == "auto":
+        if algorithm == "linclust":
+            sensitivity = None
+        else:
+            sensitivity = next(s for identity, s in _AUTO_SENSITIVITY if min_seq_id >= identity)
+            logger.debug(f"Using sensitivity {sensitivity} for min_seq_id={min_seq_id}")
+    if sensitivity is not None and (isinstance(sensitivity, str) or sensitivity <= 0):
+        raise ValueError(f"sensitivity must be positive or 'auto', got {sensitivity}")
+    for name, limit in [
+        ("max_seqs", max_seqs),
+        ("max_accept", max_accept),
+        ("max_rejected", max_rejected),
+    ]:
+        if limit is not None and (not isinstance(limit, int) or limit <= 0):
+            raise ValueError(f"{name} must be a positive integer, got {limit}")
+    if algorithm == "linclust":
+        # linclust has no k-mer prefilter
+        if sensitivity is not None or max_seqs is not None:
+            logger.warning(
+                "sensitivity and max_seqs have no effect with algorithm='linclust', ignoring them"
+            )
+        sensitivity = None
+        max_seqs = None
+
+    # Deterministic runs stay single-threaded unless the caller asks otherwise
+    if threads is None:
+        threads = 1 if random_state is not None else (os.cpu_count() or 1)
 
     # get random state
     random_state = check_random_state(random_state)
@@ -79,33 +384,27 @@ def cluster(
 
     logger.info(f"Clustering {len(result_df)} sequences")
 
-    # Use .loc for assignment to avoid SettingWithCopyWarning
-    result_df.loc[:, "sanitized_id"] = result_df[id_col].str.replace(" ", "_")
-
-    # If user specified random state, sort input sequences to ensure reproducibility.
+    # If user specified random state, sort input sequences (then sanitized IDs) to ensure
+    # reproducibility.
     if random_state is not None:
-        result_df = result_df.sort_values(by=[sequence_col, "sanitized_id"])
+        result_df = result_df.sort_values(
+            by=[sequence_col, id_col],
+            key=lambda col: col.str.translate(_SPACE_TO_UNDERSCORE) if col.name == id_col else col,
+        )
+
+    # Sanitized IDs are kept alongside result_df rather than as a temporary column
+    sanitized_ids = result_df[id_col].str.translate(_SPACE_TO_UNDERSCORE)
 
-    tmp_dir = tempfile.mkdtemp()
+    # Cached sequence databases live next to the scratch directories, under tmp_dir if given
+    db_cache_parent = tmp_dir
+    tmp_dir = tempfile.mkdtemp(dir=tmp_dir)
     logger.debug(f"Created temporary directory: {tmp_dir}")
 
     try:
-        input_fasta = os.path.join(tmp_dir, "input.fasta")
-        with open(input_fasta, "w") as fasta_file:
-            for _, row in result_df.iterrows():
-                fasta_file.write(f">{row['sanitized_id']}\n{row[sequence_col]}\n")
-
-        logger.debug(f"Wrote {len(result_df)} sequences to FASTA file")
-
         output_dir = os.path.join(tmp_dir, "output")
         tmp_mmseqs = os.path.join(tmp_dir, "tmp_mmseqs")
 
-        mmseqs_cmd = [
-            "mmseqs",
-            "easy-cluster",
-            input_fasta,
-            output_dir,
-            tmp_mmseqs,
+        cluster_options = [
             "--min-seq-id",
             str(min_seq_id),
             "-c",
@@ -116,57 +415,86 @@ def cluster(
             str(alignment_mode),
             "--cluster-mode",
             str(cluster_mode),
-            "--cluster-steps",
-            str(cluster_steps),
         ]
 
+        # Cascaded clustering steps only exist in the cluster workflow
+        if algorithm == "cluster":
+            cluster_options.extend(["--cluster-steps", str(cluster_steps)])
+
+        createdb_options = []
         if random_state is not None:
-            mmseqs_cmd.extend(["--shuffle", "0", "--threads", "1"])
+            createdb_options.extend(["--shuffle", "0"])
+
+        run_options = ["--threads", str(threads)]
+        if sensitivity is not None:
+            run_options.extend(["-s", str(sensitivity)])
+        for flag, limit in [
+            ("--max-seqs", max_seqs),
+            ("--max-accept", max_accept),
+            ("--max-rejected", max_rejected),
+        ]:
+            if limit is not None:
+                run_options.extend([flag, str(limit)])
 
-        logger.debug(f"Running MMseqs2 command: {' '.join(mmseqs_cmd)}")
+        clusters_file = os.path.join(output_dir + "_cluster.tsv")
 
-        if logger.level <= logging.DEBUG:
-            subprocess.run(mmseqs_cmd, check=True)
+        if reuse_db:
+            # Run the workflow's steps separately so the sequence database can be shared
+            cluster_db = os.path.join(tmp_dir, "clusterDB")
+            with _cached_sequence_db(
+                sanitized_ids, result_df[sequence_col], createdb_options, db_cache_parent
+            ) as sequence_db:
+                _run_mmseqs(
+                    ["mmseqs", algorithm, sequence_db, cluster_db, tmp_mmseqs]
+                    + cluster_options
+                    + run_options
+                )
+                _run_mmseqs(
+                    ["mmseqs", "createtsv", sequence_db, sequence_db, cluster_db, clusters_file]
+                    + ["--threads", str(threads)]
+                )
+            clusters_tsv = _read_cluster_tsv(clusters_file)
         else:
-            subprocess.run(
-                mmseqs_cmd,
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            input_fasta = os.path.join(tmp_dir, "input.fasta")
+            _write_fasta(input_fasta, sanitized_ids, result_df[sequence_col])
 
-        clusters_file = os.path.join(output_dir + "_cluster.tsv")
-        if not os.path.exists(clusters_file):
-            logger.error("MMseqs2 clustering results file not found")
-            raise FileNotFoundError("MMseqs2 clustering results not found.")
+            logger.debug(f"Wrote {len(result_df)} sequences to FASTA file")
 
-        logger.debug(f"Reading clustering results from {clusters_file}")
+            mmseqs_cmd = (
+                ["mmseqs", f"easy-{algorithm}", input_fasta, output_dir, tmp_mmseqs]
+                + cluster_options
+                + createdb_options
+                + run_options
+            )
+
+            if len(result_df) >= _OVERLAP_MIN_SEQUENCES:
+                logger.debug(f"Running MMseqs2 command: {' '.join(mmseqs_cmd)}")
+                clusters_tsv = _run_mmseqs_overlapped(mmseqs_cmd, clusters_file)
+            else:
+                _run_mmseqs(mmseqs_cmd)
+                clusters_tsv = _read_cluster_tsv(clusters_file)
 
-        cluster_map = {}
-        cluster_sizes = {}
-        with open(clusters_file, "r") as f:
-            for line in f:
-                rep, seq = line.strip().split("\t")
-                cluster_map[seq] = rep
-                cluster_sizes[rep] = cluster_sizes.get(rep, 0) + 1
+        cluster_map = dict(zip(clusters_tsv["seq"], clusters_tsv["rep"]))
+        cluster_sizes = clusters_tsv["rep"].value_counts()
 
         logger.info(f"Found {len(cluster_sizes)} clusters")
 
         if logger.level <= logging.DEBUG:
             # Report cluster distribution statistics
-            cluster_size_counts = {}
-            for size in cluster_sizes.values():
-                cluster_size_counts[size] = cluster_size_counts.get(size, 0) + 1
+            cluster_size_counts = cluster_sizes.value_counts().sort_index()
 
             logger.debug("Cluster size distribution:")
-            for size in sorted(cluster_size_counts.keys()):
-                logger.debug(f"  Size {size}: {cluster_size_counts[size]} clusters")
+            for size, count in cluster_size_counts.items():
+                logger.debug(f"  Size {size}: {count} clusters")
+
+        reverse_map = dict(zip(sanitized_ids, result_df[id_col]))
 
-        reverse_map = dict(zip(result_df["sanitized_id"], result_df[id_col]))
+        # Map member -> representative -> original ID; unmatched IDs fall back to themselves
+        representative_ids = sanitized_ids.map(cluster_map).fillna(sanitized_ids)
 
         # Use .loc for assignment to avoid SettingWithCopyWarning
-        result_df.loc[:, "representative_sequence"] = result_df["sanitized_id"].apply(
-            lambda x: reverse_map.get(cluster_map.get(x, x), x)
+        result_df.loc[:, "representative_sequence"] = representative_ids.map(reverse_map).fillna(
+            sanitized_ids
         )
 
         logger.info("Clustering complete, added 'representative_sequence' column to DataFrame")
@@ -175,6 +503,90 @@ def cluster(
         logger.debug(f"Cleaning up temporary directory: {tmp_dir}")
         shutil.rmtree(tmp_dir)
 
-    # Avoid inplace=True to prevent SettingWithCopyWarning
-    result_df = result_df.drop(columns=["sanitized_id"])
     return result_df
+
+
+def cluster_many(dfs, sequence_col, id_col=None, **cluster_kwargs):
+    """
+    Clusters several DataFrames with a single MMseqs2 run.
+
+    The inputs are concatenated with a per-DataFrame ID prefix, clustered once (amortizing
+    MMseqs2 startup and database creation), and the results are split back out. Because
+    clustering is joint, a sequence's representative may come from a different DataFrame.
+
+    Parameters:
+        dfs (list of pd.DataFrame): DataFrames to cluster.
+        sequence_col (str): Name of the column containing sequences.
+        id_col (str): Unique ID column. If None, each DataFrame's index is used.
+        **cluster_kwargs: Additional keyword arguments passed to cluster().
+
+    Returns:
+        list of pd.DataFrame: Copies of the inputs, in order, each with a new
+        'representative_sequence' column holding the representative's original ID.
+    """
+    logger.info(f"Clustering {len(dfs)} DataFrames in a single MMseqs2 run")
+
+    batches = []
+    for batch_idx, df in enumerate(dfs):
+        if sequence_col not in df or (id_col is not None and id_col not in df):
+            logger.error(f"Required columns missing in DataFrame {batch_idx}")
+            raise ValueError(f"DataFrame {batch_idx} must have '{id_col}' and '{sequence_col}'.")
+
+        ids = df.index.to_series() if id_col is None else df[id_col]
+        ids = ids.astype(str).str.translate(_SPACE_TO_UNDERSCORE)
+        batches.append(
+            pd.DataFrame(
+                {
+                    sequence_col: df[sequence_col].to_numpy(),
+                    "batch_id": (f"b{batch_idx}_" + ids).to_numpy(),
+                    "original_id": (df.index if id_col is None else df[id_col]).to_numpy(),
+                    "batch": batch_idx,
+                    "row": range(len(df)),
+                }
+            )
+        )
+
+    if not batches:
+        return []
+
+    combined = pd.concat(batches, ignore_index=True)
+    clustered = cluster(combined, sequence_col=sequence_col, id_col="batch_id", **cluster_kwargs)
+
+    # Translate prefixed representative IDs back to the IDs of the original DataFrames
+    original_ids = dict(zip(combined["batch_id"], combined["original_id"]))
+    clustered["representative_sequence"] = clustered["representative_sequence"].map(original_ids)
+
+    results = []
+    for batch_idx, df in enumerate(dfs):
+        batch = clustered[clustered["batch"] == batch_idx].sort_values("row")
+        result_df = df.copy()
+        result_df["representative_sequence"] = batch["representative_sequence"].to_numpy()
+        results.append(result_df)
+
+    return results
+
+
+def cluster_parallel(params_list, max_workers=2):
+    """
+    Runs several independent cluster() calls concurrently.
+
+    Each job spends nearly all of its time waiting on its MMseqs2 subprocess, so a thread
+    pool lets the operating system run the MMseqs2 processes side by side. Useful for
+    parameter sweeps (e.g. over min_seq_id). Consider setting 'threads' in each job so the
+    combined MMseqs2 thread count does not oversubscribe the machine.
+
+    Parameters:
+        params_list (list of dict): Keyword arguments for each cluster() call.
+        max_workers (int): Maximum number of concurrent MMseqs2 runs (default 2).
+
+    Returns:
+        list of pd.DataFrame: Clustered DataFrames, in the same order as params_list.
+    """
+    if not isinstance(max_workers, int) or max_workers <= 0:
+        raise ValueError(f"max_workers must be a positive integer, got {max_workers}")
+
+    logger.info(f"Running {len(params_list)} clustering jobs with up to {max_workers} workers")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(cluster, **params) for params in params_list]
+        return [future.result() for future in futures]
@@ -3,7 +3,6 @@
 from typing import List, Optional
 
 import numpy as np
-import torch
 
 from ..logger import logger
 from .baseline import BaseEmbedder
@@ -28,6 +27,8 @@ class ESMEmbedder(BaseEmbedder):
             layer: Which layer to extract embeddings from (-1 for last layer)
             device: Device to run inference on ('cpu', 'cuda', 'mps', or None for auto)
         """
+        import torch
+
         self.model_name = model_name
 
         # Set device
@@ -93,6 +94,8 @@ class ESMEmbedder(BaseEmbedder):
         Returns:
             Embedding array
         """
+        import torch
+
         # Handle empty sequence
         if not sequence:
             if pooling == "none" or (pooling == "auto" and self.default_pooling == "none"):
@@ -135,6 +138,8 @@ class ESMEmbedder(BaseEmbedder):
         Returns:
             List of embedding arrays
         """
+        import torch
+
         if not sequences:
             return []
 
@@ -3,7 +3,6 @@
 from typing import List, Optional
 
 import numpy as np
-import torch
 
 from ..logger import logger
 from .baseline import BaseEmbedder
@@ -26,6 +25,8 @@ class RayGunEmbedder(BaseEmbedder):
             esm_model_name: Name of the ESM model to use for initial embeddings
             device: Device to run inference on ('cpu', 'cuda', 'mps', or None for auto)
         """
+        import torch
+
         self.esm_model_name = esm_model_name
 
         # Set device
@@ -46,6 +47,8 @@ class RayGunEmbedder(BaseEmbedder):
 
     def _initialize_models(self):
         """Initialize the ESM and RayGun models."""
+        import torch
+
         try:
             import esm
         except ImportError:
@@ -101,6 +104,8 @@ class RayGunEmbedder(BaseEmbedder):
         Returns:
             Embedding array
         """
+        import torch
+
         # Handle empty sequence
         if not sequence:
             if pooling == "none" or (pooling == "auto" and self.default_pooling == "none"):
@@ -153,6 +158,8 @@ class RayGunEmbedder(BaseEmbedder):
         Returns:
             List of embedding arrays
         """
+        import torch
+
         if not sequences:
             return []
 
@@ -3,7 +3,6 @@
 from typing import List, Optional
 
 import numpy as np
-import torch
 
 from ..logger import logger
 from .baseline import BaseEmbedder
@@ -38,6 +37,8 @@ class ProtTransEmbedder(BaseEmbedder):
             layer: Which layer to extract embeddings from (-1 for last).
             device: Device to run inference on ('cpu', 'cuda', 'mps', or None for auto).
         """
+        import torch
+
         # Map short names to full model names
         if model_name in self.PROTEIN_MODELS:
             self.model_name = self.PROTEIN_MODELS[model_name]
@@ -120,6 +121,8 @@ class ProtTransEmbedder(BaseEmbedder):
         Returns:
             Embedding array
         """
+        import torch
+
         # Handle empty sequence case
         if not sequence:
             if pooling == "none" or (pooling == "auto" and self.default_pooling == "none"):
@@ -175,6 +178,8 @@ class ProtTransEmbedder(BaseEmbedder):
         Returns:
             List of embedding arrays
         """
+        import torch
+
         if not sequences:
             return []
 
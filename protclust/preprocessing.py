@@ -1,6 +1,33 @@
+import numpy as np
+import pandas as pd
+
 from .logger import logger
 
 
+def _validate_sequences(sequences, valid_amino_acids):
+    """
+    Checks which sequences contain only valid amino acid characters.
+
+    Parameters:
+        sequences (list of str): Non-empty uppercase sequences.
+        valid_amino_acids (str): String of valid amino acid characters.
+
+    Returns:
+        np.ndarray: Boolean array, True where a sequence is valid.
+    """
+    valid_bytes = valid_amino_acids.upper().encode("ascii", errors="ignore")
+
+    # Deleting every valid residue with bytes.translate (a C-level scan) leaves nothing
+    # behind for valid sequences; non-ASCII characters become "?" and are always rejected
+    return np.array(
+        [
+            not seq.encode("ascii", errors="replace").translate(None, valid_bytes)
+            for seq in sequences
+        ],
+        dtype=bool,
+    )
+
+
 def clean(df, sequence_col="sequence", valid_amino_acids="ACDEFGHIKLMNPQRSTVWY"):
     """
     Removes sequences with invalid protein characters.
@@ -29,16 +56,25 @@ def clean(df, sequence_col="sequence", valid_amino_acids="ACDEFGHIKLMNPQRSTVWY")
     df = df.dropna(subset=[sequence_col])
     logger.debug(f"After removing NaN values: {len(df)} sequences")
 
+    # Work on unique sequences only; duplicated sequences are uppercased and validated once
+    codes, unique_sequences = pd.factorize(df[sequence_col])
+    unique_sequences = pd.Series(unique_sequences, dtype=object)
+
     # Convert to uppercase
-    df[sequence_col] = df[sequence_col].str.upper()
+    unique_sequences = unique_sequences.str.upper()
+    df[sequence_col] = unique_sequences.to_numpy()[codes]
 
     # Filter out empty sequences
-    df = df[df[sequence_col].str.len() > 0]
+    non_empty = (unique_sequences.str.len() > 0).to_numpy()
+    df = df[non_empty[codes]]
+    codes = codes[non_empty[codes]]
 
     # Filter sequences with invalid amino acids
-    valid_sequence_mask = df[sequence_col].apply(
-        lambda seq: all(aa in valid_amino_acids for aa in seq)
+    valid_unique = np.zeros(len(unique_sequences), dtype=bool)
+    valid_unique[non_empty] = _validate_sequences(
+        unique_sequences[non_empty].tolist(), valid_amino_acids
     )
+    valid_sequence_mask = valid_unique[codes]
 
     result_df = df[valid_sequence_mask].reset_index(drop=True)
 
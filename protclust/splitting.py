@@ -10,12 +10,82 @@ from .logger import logger
 from .utils import check_random_state
 
 
+def _greedy_group_selection(sizes, target_test_count):
+    """
+    Selects groups largest-first, keeping each one that moves the total closer to target.
+
+    Parameters:
+        sizes (np.ndarray): Group sizes, in the (shuffled) group order.
+        target_test_count (int): Desired number of sequences in the test set.
+
+    Returns:
+        list: Sorted indices into sizes of the selected groups.
+    """
+    # Stable sort keeps the shuffled order among equally sized groups
+    order = np.argsort(-sizes, kind="stable")
+
+    selected = []
+    current_sum = 0
+    for idx in order:
+        new_sum = current_sum + sizes[idx]
+        if abs(new_sum - target_test_count) < abs(current_sum - target_test_count):
+            selected.append(int(idx))
+            current_sum = new_sum
+    selected.sort()
+    return selected
+
+
+def _subset_sum_group_selection(sizes, target_test_count):
+    """
+    Selects the groups whose total size is closest to target using subset-sum DP.
+
+    Parameters:
+        sizes (np.ndarray): Group sizes, in the (shuffled) group order.
+        target_test_count (int): Desired number of sequences in the test set.
+
+    Returns:
+        list: Sorted indices into sizes of the selected groups.
+    """
+    # Use dynamic programming to find subset of groups that gets closest to target test size.
+    # reachable[s] marks achievable test set sizes; parent[s] records the group that first
+    # reached s, so the chosen groups can be recovered by walking back through parent.
+    # The closest sum never exceeds target + largest group (removing any group from a larger
+    # sum would get closer), so sums above that cap are never tracked.
+    cap = min(int(sizes.sum()), target_test_count + int(sizes.max(initial=0)))
+    reachable = np.zeros(cap + 1, dtype=bool)
+    reachable[0] = True
+    parent = np.full(cap + 1, -1, dtype=np.int64)
+    for idx, group_size in enumerate(sizes):
+        if group_size > cap:
+            continue
+        shifted = np.zeros_like(reachable)
+        shifted[group_size:] = reachable[: cap + 1 - group_size]
+        newly_reached = shifted & ~reachable
+        parent[newly_reached] = idx
+        reachable |= shifted
+
+    # Find the sum closest to target_test_count (smallest sum wins ties for determinism)
+    all_sums = np.flatnonzero(reachable)
+    best_sum = int(all_sums[np.argmin(np.abs(all_sums - target_test_count))])
+
+    # Sort the indices for deterministic selection
+    best_group_indices = []
+    current_sum = best_sum
+    while current_sum > 0:
+        idx = int(parent[current_sum])
+        best_group_indices.append(idx)
+        current_sum -= sizes[idx]
+    best_group_indices.sort()
+    return best_group_indices
+
+
 def split(
     df,
     group_col="representative_sequence",
     test_size=0.2,
     random_state=None,
     tolerance=0.05,
+    method="dp",
 ):
     """
     Splits DataFrame into train/test sets based on grouping in a specified column.
@@ -26,12 +96,19 @@ def split(
         test_size (float): Desired fraction of data in test set (default 0.2).
         random_state (int): Random state for reproducibility in group selection.
         tolerance (float): Acceptable deviation from test_size (default 0.05).
+        method (str): Group selection strategy (default "dp"):
+            "greedy": add groups largest-first while they move the test size closer to target
+            "dp": subset-sum dynamic programming for the closest achievable test size
+            "auto": use the greedy result if it is within tolerance, otherwise "dp"
 
     Returns:
         (pd.DataFrame, pd.DataFrame): (train_df, test_df)
     """
     logger.info(f"Splitting data by '{group_col}' with target test size {test_size}")
 
+    if method not in ("auto", "greedy", "dp"):
+        raise ValueError(f"method must be 'auto', 'greedy', or 'dp', got {method}")
+
     # Get random state for reproducibility
     rng = check_random_state(random_state)
 
@@ -44,53 +121,42 @@ def split(
     logger.info(f"Total sequence count: {total_sequences}")
     logger.info(f"Target test count: {target_test_count}")
 
-    # Get group sizes
-    size_per_group = df.groupby(group_col).size()
+    # Get group sizes from integer group codes; rows with a missing group label get code -1
+    # and are never selected for the test set
+    group_codes, unique_groups = pd.factorize(df[group_col])
+    size_per_group = np.bincount(group_codes[group_codes >= 0], minlength=len(unique_groups))
 
-    # Create tuples of (group, size) and sort them deterministically
-    group_size_pairs = [(group, size) for group, size in size_per_group.items()]
-    group_size_pairs.sort(key=lambda x: str(x[0]))  # Deterministic sorting
+    # Sort groups deterministically by name, then shuffle using the random state
+    order = np.argsort(unique_groups.astype(str).to_numpy(), kind="stable")
+    rng.shuffle(order)
 
-    # Shuffle using the global random state
-    rng.shuffle(group_size_pairs)
+    sizes = size_per_group[order]
 
-    groups = [pair[0] for pair in group_size_pairs]
-    sizes = [pair[1] for pair in group_size_pairs]
+    logger.debug(f"Found {len(order)} unique groups in '{group_col}'")
 
-    logger.debug(f"Found {len(groups)} unique groups in '{group_col}'")
-    logger.debug("Finding optimal subset-sum solution for test set")
+    best_group_indices = None
+    if method in ("auto", "greedy"):
+        best_group_indices = _greedy_group_selection(sizes, target_test_count)
+        greedy_sum = int(sizes[best_group_indices].sum())
+        logger.debug(f"Greedy selection reached a test set of {greedy_sum} sequences")
+        if method == "auto" and abs(greedy_sum / total_sequences - test_size) > tolerance:
+            logger.debug("Greedy selection outside tolerance, falling back to subset-sum")
+            best_group_indices = None
 
-    # Use dynamic programming to find subset of groups that gets closest to target test size
-    dp = {0: []}
-    for idx, group_size in enumerate(sizes):
-        current_dp = dict(dp)
-        for current_sum, idx_list in dp.items():
-            new_sum = current_sum + group_size
-            if new_sum not in current_dp:
-                current_dp[new_sum] = idx_list + [idx]
-        dp = current_dp
+    if best_group_indices is None:
+        best_group_indices = _subset_sum_group_selection(sizes, target_test_count)
 
-    # Find the sum closest to target_test_count
-    all_sums = sorted(dp.keys())
-
-    distances = [(s, abs(s - target_test_count)) for s in all_sums]
-    min_distance = min(distances, key=lambda x: x[1])[1]
-
-    # Find all sums that have this minimum distance
-    candidate_sums = [s for s, d in distances if d == min_distance]
-
-    # Ensure deterministic selection
-    best_sum = min(candidate_sums)
-
-    # Sort the indices for deterministic selection
-    best_group_indices = sorted(dp[best_sum])
-    chosen_groups = [groups[i] for i in best_group_indices]
+    best_sum = int(sizes[best_group_indices].sum())
 
     logger.debug(f"Best achievable test set size: {best_sum} sequences")
-    logger.debug(f"Selected {len(chosen_groups)} groups for test set")
+    logger.debug(f"Selected {len(best_group_indices)} groups for test set")
 
-    test_df = df[df[group_col].isin(chosen_groups)]
-    train_df = df[~df[group_col].isin(chosen_groups)]
+    # Map the chosen positions back to group codes and select rows by code
+    in_test = np.zeros(len(unique_groups) + 1, dtype=bool)  # trailing slot for code -1
+    in_test[order[best_group_indices]] = True
+    test_mask = in_test[group_codes]
+    test_df = df[test_mask]
+    train_df = df[~test_mask]
 
     achieved_test_fraction = len(test_df) / total_sequences
 
@@ -120,6 +186,7 @@ def train_test_cluster_split(
     cluster_steps=1,
     random_state=None,
     tolerance=0.05,
+    method="dp",
 ):
     """
     Clusters sequences and splits data into train/test sets by grouping entire clusters.
@@ -160,6 +227,7 @@ def train_test_cluster_split(
         test_size=test_size,
         random_state=random_state,
         tolerance=tolerance,
+        method=method,
     )
 
 
@@ -177,6 +245,7 @@ def train_test_val_cluster_split(
     cluster_steps=1,
     random_state=None,
     tolerance=0.05,
+    method="dp",
 ):
     """
     Clusters sequences and splits data into train, val, and test sets by grouping entire clusters.
@@ -223,6 +292,7 @@ def train_test_val_cluster_split(
         test_size=test_size,
         random_state=random_state,
         tolerance=tolerance,
+        method=method,
     )
 
     logger.info("Step 3: Further splitting train+val into train vs val")
@@ -235,6 +305,7 @@ def train_test_val_cluster_split(
         test_size=adjusted_val_fraction,
         random_state=random_state,
         tolerance=tolerance,
+        method=method,
     )
 
     total = len(df)
@@ -256,6 +327,7 @@ def constrained_split(
     force_train_ids=None,
     force_test_ids=None,
     id_type="sequence",
+    method="dp",
 ):
     """
     Splits data with constraints on which sequences or groups must be in the train or test set.
@@ -306,6 +378,10 @@ def constrained_split(
         logger.error(f"Found {len(group_conflicts)} groups forced to both train and test")
         raise ValueError("Constraint conflict: some groups are forced to both train and test sets")
 
+    total_size = len(df)
+    if total_size == 0:
+        return df.copy(), df.copy()  # Return two empty DataFrames
+
     # Create forced splits based on group_col membership
     train_forced_mask = df[group_col].isin(forced_train_groups)
     test_forced_mask = df[group_col].isin(forced_test_groups)
@@ -314,7 +390,6 @@ def constrained_split(
     test_forced = df[test_forced_mask]
     remaining = df[~(train_forced_mask | test_forced_mask)]
 
-    total_size = len(df)
     train_forced_size = len(train_forced)
     test_forced_size = len(test_forced)
     remaining_size = len(remaining)
@@ -335,7 +410,10 @@ def constrained_split(
         )
 
     # Calculate target test size for the remaining sequences
-    target_test_from_remaining = max(0, (test_size * total_size) - test_forced_size)
+    # Whole-sequence target computed once, the same way split() rounds its own target, so the
+    # remaining data is not rounded a second time from a fractional count
+    target_test_count = int(round(test_size * total_size))
+    target_test_from_remaining = max(0, target_test_count - test_forced_size)
     if remaining_size > 0:
         adjusted_test_size = target_test_from_remaining / remaining_size
         adjusted_test_size = min(1.0, max(0.0, adjusted_test_size))
@@ -349,6 +427,7 @@ def constrained_split(
                 test_size=adjusted_test_size,
                 random_state=random_state,
                 tolerance=tolerance,
+                method=method,
             )
         elif adjusted_test_size <= 0:
             train_remaining, test_remaining = remaining.copy(), remaining.iloc[0:0]
@@ -408,6 +487,13 @@ def cluster_kfold(
         min_seq_id, coverage, cov_mode, alignment_mode, cluster_mode, cluster_steps
     )
 
+    if len(df) == 0:
+        # Nothing to cluster; every fold is an empty train/test pair
+        if return_indices:
+            return [(df.index, df.index) for _ in range(n_splits)]
+        empty_df = df.assign(representative_sequence=df[sequence_col])
+        return [(empty_df.copy(), empty_df.copy()) for _ in range(n_splits)]
+
     # First, cluster the sequences
     df_clustered = perform_clustering(  # Use the renamed import
         df=df,
@@ -483,15 +569,16 @@ def cluster_kfold(
             f"diff={fold_imbalance:.1%}). Consider adjusting clustering parameters."
         )
 
+    # Look up every sequence's fold once; unassigned clusters map to NaN (never test)
+    sequence_folds = df_clustered["representative_sequence"].map(cluster_to_fold).to_numpy()
+
     # For each fold, create train/test split
     result = []
     for fold_idx in range(n_splits):
         logger.info(f"Preparing fold {fold_idx + 1}/{n_splits}")
 
         # Create mask for test set (current fold)
-        test_mask = df_clustered["representative_sequence"].apply(
-            lambda x: cluster_to_fold.get(x) == fold_idx
-        )
+        test_mask = sequence_folds == fold_idx
 
         if return_indices:
             train_indices = df_clustered[~test_mask].index
@@ -512,6 +599,248 @@ def cluster_kfold(
     return result
 
 
+def _residue_statistics(values, prefix):
+    """
+    Summarises per-residue arrays into scalar statistics for MILP balancing.
+
+    Arrays of equal length are stacked into one matrix and reduced along axis 1, so NumPy
+    is called once per distinct length rather than once per protein and statistic.
+
+    Parameters:
+        values (pd.Series): Lists or arrays of per-residue values; other entries are missing.
+        prefix (str): Prefix for the derived column names.
+
+    Returns:
+        pd.DataFrame: '{prefix}_mean', '_min', '_max', '_var', '_p25', '_p50' and '_p75'
+        columns aligned with values, NaN where a statistic is undefined.
+    """
+    arrays = [
+        np.asarray(x, dtype=float).ravel() if isinstance(x, (list, np.ndarray)) else None
+        for x in values
+    ]
+    lengths = np.array([0 if x is None else x.size for x in arrays], dtype=np.int64)
+
+    names = ["mean", "min", "max", "var", "p25", "p50", "p75"]
+    stats = {name: np.full(len(arrays), np.nan) for name in names}
+
+    for length in np.unique(lengths[lengths > 0]):
+        rows = np.flatnonzero(lengths == length)
+        matrix = np.stack([arrays[i] for i in rows])
+
+        stats["mean"][rows] = matrix.mean(axis=1)
+        stats["min"][rows] = matrix.min(axis=1)
+        stats["max"][rows] = matrix.max(axis=1)
+        if length > 1:
+            stats["var"][rows] = matrix.var(axis=1)
+        stats["p25"][rows], stats["p50"][rows], stats["p75"][rows] = np.percentile(
+            matrix, [25, 50, 75], axis=1
+        )
+
+    return pd.DataFrame({f"{prefix}_{name}": stats[name] for name in names}, index=values.index)
+
+
+def _solve_split_highs(n_groups, deviation_terms, time_limit):
+    """
+    Solves the milp_split model with HiGHS through scipy.optimize.milp.
+
+    The model is handed to HiGHS as NumPy arrays, so there is no per-term expression
+    building and no LP file round trip through a solver executable.
+
+    Parameters:
+        n_groups (int): Number of binary group variables.
+        deviation_terms (list): (weight, coefficients, target) tuples, one per
+            deviation variable; coefficients is None for unconstrained terms.
+        time_limit (int): Maximum time in seconds to spend solving.
+
+    Returns:
+        np.ndarray or None: Boolean array, True for groups in the test set, or None if
+        HiGHS found no feasible solution.
+    """
+    try:
+        from scipy.optimize import Bounds, LinearConstraint, milp
+    except ImportError:
+        logger.error(
+            "scipy>=1.9 is required for the HiGHS solver. Install with 'pip install scipy'"
+        )
+        raise ImportError("scipy>=1.9 is required for the HiGHS solver")
+
+    n_terms = len(deviation_terms)
+
+    # Variables are the group indicators followed by one deviation variable per term
+    objective = np.concatenate([np.zeros(n_groups), [weight for weight, _, _ in deviation_terms]])
+
+    rows = []
+    lower_bounds = []
+    for j, (_, coefficients, target) in enumerate(deviation_terms):
+        if coefficients is None:
+            continue
+        deviation = np.zeros(n_terms)
+        deviation[j] = 1.0
+        # deviation >= sum - target and deviation >= target - sum
+        rows.append(np.concatenate([-coefficients, deviation]))
+        lower_bounds.append(-target)
+        rows.append(np.concatenate([coefficients, deviation]))
+        lower_bounds.append(target)
+
+    result = milp(
+        objective,
+        constraints=LinearConstraint(np.array(rows), lower_bounds, np.inf),
+        integrality=np.concatenate([np.ones(n_groups), np.zeros(n_terms)]),
+        bounds=Bounds(0, np.concatenate([np.ones(n_groups), np.full(n_terms, np.inf)])),
+        options={"time_limit": time_limit, "disp": logger.level <= logging.INFO},
+    )
+
+    logger.info(f"MILP solution status: {result.message}")
+
+    if result.x is None:
+        logger.warning("HiGHS found no feasible solution")
+        return None
+
+    if result.status != 0:  # Not optimal
+        logger.warning("MILP solution not optimal, using best found solution")
+
+    return result.x[:n_groups] > 0.5
+
+
+def _split_objective(in_test, deviation_terms):
+    """
+    Evaluates the milp_split objective for a fixed test-set assignment.
+
+    Parameters:
+        in_test (np.ndarray): Boolean array, True for groups in the test set.
+        deviation_terms (list): (weight, coefficients, target) tuples.
+
+    Returns:
+        float: Weighted sum of absolute deviations from each target.
+    """
+    x = in_test.astype(float)
+    return sum(
+        weight * abs(coefficients @ x - target)
+        for weight, coefficients, target in deviation_terms
+        if coefficients is not None
+    )
+
+
+def _solve_split_pulp(n_groups, deviation_terms, time_limit, initial_test=None):
+    """
+    Solves the milp_split model with PuLP, preferring a time-limited CBC solver.
+
+    Parameters:
+        n_groups (int): Number of binary group variables.
+        deviation_terms (list): (weight, coefficients, target) tuples, one per
+            deviation variable; coefficients is None for unconstrained terms.
+        time_limit (int): Maximum time in seconds to spend solving.
+        initial_test (np.ndarray): Optional boolean array of groups to start in the test
+            set, passed to CBC as a MIP start.
+
+    Returns:
+        np.ndarray: Boolean array, True for groups in the test set.
+    """
+    try:
+        from pulp import (
+            COIN_CMD,
+            PULP_CBC_CMD,
+            LpAffineExpression,
+            LpBinary,
+            LpConstraint,
+            LpConstraintGE,
+            LpMinimize,
+            LpProblem,
+            LpStatus,
+            LpVariable,
+            PulpSolverError,
+            value,
+        )
+    except ImportError:
+        logger.error("PuLP is required for MILP-based splitting. Install with 'pip install pulp'")
+        raise ImportError("PuLP is required for MILP-based splitting")
+
+    # Create the MILP problem
+    prob = LpProblem("ClusterSplit", LpMinimize)
+
+    # Decision variables (1 if group is in test set, 0 if in train set). Variables get short
+    # index-based names: PuLP keys, sanitizes and writes every name to the solver file, and
+    # column-derived names could collide once sanitized
+    group_vars = [LpVariable(f"x{i}", cat=LpBinary) for i in range(n_groups)]
+
+    # Variables to represent absolute differences from each target
+    deviation_vars = [LpVariable(f"d{j}", lowBound=0) for j in range(len(deviation_terms))]
+
+    # Seed CBC with a feasible incumbent so the time limit is spent improving on it
+    warm_start = initial_test is not None
+    if warm_start:
+        for var, start in zip(group_vars, initial_test):
+            var.setInitialValue(int(start))
+
+    # Objective: minimize all deviations with their respective weights
+    prob += LpAffineExpression(
+        [(var, weight) for var, (weight, _, _) in zip(deviation_vars, deviation_terms)]
+    )
+
+    # Each |sum - target| <= deviation pair is written as two LpConstraints built straight
+    # from (variable, coefficient) pairs; going through lpSum and >= would grow and copy an
+    # expression dict term by term
+    for deviation_var, (_, coefficients, target) in zip(deviation_vars, deviation_terms):
+        if coefficients is None:
+            continue
+        for sign in (1, -1):
+            expression = LpAffineExpression(
+                [(deviation_var, 1)]
+                + [(var, -sign * coef) for var, coef in zip(group_vars, coefficients)]
+            )
+            prob.addConstraint(LpConstraint(expression, LpConstraintGE, rhs=-sign * target))
+
+    logger.info(f"Attempting to set MILP solver time limit to {time_limit} seconds")
+
+    # Try different solver options in order of preference
+    solver = None
+
+    if logger.level <= logging.INFO:
+        # Option 1: Try PuLP's CBC CMD interface
+        try:
+            solver = PULP_CBC_CMD(timeLimit=time_limit, warmStart=warm_start)
+            prob.solve(solver)
+        except PulpSolverError as e:
+            logger.warning(f"CBC solver not available: {e}")
+            solver = None
+
+        # Option 2: Try COIN_CMD if available (needs coinor-cbc installed)
+        if solver is None:
+            try:
+                logger.info("Trying COIN_CMD solver")
+                solver = COIN_CMD(timeLimit=time_limit, warmStart=warm_start)
+                prob.solve(solver)
+            except (PulpSolverError, Exception) as e:
+                logger.warning(f"COIN_CMD solver not available: {e}")
+                solver = None
+
+        # Option 3: Fall back to default solver with no time limit
+        if solver is None:
+            logger.warning(
+                "No time-limited solver available. Using default solver without time limit."
+            )
+            logger.warning("To enable time limits, install CBC solver: pip install pulp[cbc]")
+            prob.solve()
+    else:
+        # Run solvers silently at WARNING or higher levels
+        try:
+            solver = PULP_CBC_CMD(timeLimit=time_limit, msg=False, warmStart=warm_start)
+            prob.solve(solver)
+        except PulpSolverError:
+            try:
+                solver = COIN_CMD(timeLimit=time_limit, msg=False, warmStart=warm_start)
+                prob.solve(solver)
+            except (PulpSolverError, Exception):
+                prob.solve(PULP_CBC_CMD(msg=False, warmStart=warm_start))
+
+    logger.info(f"MILP solution status: {LpStatus[prob.status]}")
+
+    if prob.status != 1:  # Not optimal
+        logger.warning("MILP solution not optimal, using best found solution")
+
+    return np.array([value(var) > 0.5 for var in group_vars], dtype=bool)
+
+
 def milp_split(
     df,
     group_col="representative_sequence",
@@ -524,6 +853,8 @@ def milp_split(
     range_weight=0.5,  # Weight for min/max range balancing
     time_limit=60,
     random_state=None,
+    solver="auto",
+    warm_start=None,
 ):
     """
     Splits DataFrame into train/test sets using Mixed Integer Linear Programming (MILP)
@@ -542,32 +873,32 @@ def milp_split(
         range_weight (float): Weight for min/max range balancing (higher = more important).
         time_limit (int): Maximum time in seconds to spend solving.
         random_state (int): Random seed for reproducibility.
+        solver (str): MILP solver to use (default "auto"):
+            "highs": HiGHS through scipy.optimize.milp, solved in memory; raises
+                RuntimeError if no feasible split is found within time_limit
+            "cbc": CBC through PuLP
+            "auto": HiGHS when scipy provides it and finds a feasible split, otherwise CBC
+        warm_start (bool or list-like): Initial solution for the solver. True starts from
+            the size-balanced split() result; a list-like gives the group labels to start
+            in the test set. CBC uses it as a MIP start; HiGHS cannot be seeded through
+            scipy, so its solution is replaced by the start if it balances worse.
 
     Returns:
         (pd.DataFrame, pd.DataFrame): (train_df, test_df)
     """
-    try:
-        from pulp import (
-            PULP_CBC_CMD,
-            LpBinary,
-            LpMinimize,
-            LpProblem,
-            LpStatus,
-            LpVariable,
-            lpSum,
-            value,
-        )
-    except ImportError:
-        logger.error("PuLP is required for MILP-based splitting. Install with 'pip install pulp'")
-        raise ImportError("PuLP is required for MILP-based splitting")
+    if solver not in ("auto", "highs", "cbc"):
+        raise ValueError(f"solver must be 'auto', 'highs' or 'cbc', got {solver}")
 
     logger.info(f"Performing MILP-based splitting with target test size {test_size}")
 
+    if len(df) == 0:
+        return df.copy(), df.copy()  # Return two empty DataFrames
+
     if balance_cols is None:
         balance_cols = []
 
-    # Create a working copy of the dataframe for feature processing
-    working_df = df.copy()
+    # Derived columns are collected as whole frames and added to the working copy at once
+    derived_frames = []
 
     # Keep track of derived columns for balancing
     derived_cols = []
@@ -581,14 +912,16 @@ def milp_split(
 
             logger.info(f"Processing categorical column: {cat_col}")
 
-            # Get unique categories
-            categories = df[cat_col].unique()
-
-            # Create one-hot encoded columns
-            for cat in categories:
-                col_name = f"{cat_col}_{cat}"
-                working_df[col_name] = (df[cat_col] == cat).astype(float)
-                derived_cols.append(col_name)
+            # One-hot encode all categories in a single comparison, in order of appearance
+            codes, categories = pd.factorize(df[cat_col])
+            one_hot = pd.DataFrame(
+                codes[:, None] == np.arange(len(categories)),
+                index=df.index,
+                columns=[f"{cat_col}_{cat}" for cat in categories],
+                dtype=float,
+            )
+            derived_frames.append(one_hot)
+            derived_cols.extend(one_hot.columns)
 
             # Replace original categorical column in balance_cols with derived columns
             if cat_col in balance_cols:
@@ -610,283 +943,125 @@ def milp_split(
 
             # Basic summary statistics
             try:
-                # Mean value across residues
-                working_df[f"{res_col}_mean"] = df[res_col].apply(
-                    lambda x: np.mean(x) if isinstance(x, (list, np.ndarray)) else np.nan
-                )
-
-                # Min and max values
-                working_df[f"{res_col}_min"] = df[res_col].apply(
-                    lambda x: np.min(x) if isinstance(x, (list, np.ndarray)) else np.nan
-                )
-                working_df[f"{res_col}_max"] = df[res_col].apply(
-                    lambda x: np.max(x) if isinstance(x, (list, np.ndarray)) else np.nan
-                )
-
-                # Variance across residues
-                working_df[f"{res_col}_var"] = df[res_col].apply(
-                    lambda x: np.var(x)
-                    if isinstance(x, (list, np.ndarray)) and len(x) > 1
-                    else np.nan
-                )
-
-                # Distribution percentiles
-                working_df[f"{res_col}_p25"] = df[res_col].apply(
-                    lambda x: np.percentile(x, 25)
-                    if isinstance(x, (list, np.ndarray)) and len(x) > 0
-                    else np.nan
-                )
-                working_df[f"{res_col}_p50"] = df[res_col].apply(
-                    lambda x: np.percentile(x, 50)
-                    if isinstance(x, (list, np.ndarray)) and len(x) > 0
-                    else np.nan
-                )
-                working_df[f"{res_col}_p75"] = df[res_col].apply(
-                    lambda x: np.percentile(x, 75)
-                    if isinstance(x, (list, np.ndarray)) and len(x) > 0
-                    else np.nan
-                )
-
-                # Add derived columns to the list
-                new_cols = [
-                    f"{res_col}_mean",
-                    f"{res_col}_min",
-                    f"{res_col}_max",
-                    f"{res_col}_var",
-                    f"{res_col}_p25",
-                    f"{res_col}_p50",
-                    f"{res_col}_p75",
-                ]
-                residue_derived_cols.extend(new_cols)
+                residue_stats = _residue_statistics(df[res_col], res_col)
 
                 # Replace NaN values with column means to avoid issues in optimization
-                for col in new_cols:
-                    if working_df[col].isna().any():
-                        col_mean = working_df[col].mean()
-                        working_df[col].fillna(col_mean, inplace=True)
+                for col in residue_stats.columns:
+                    if residue_stats[col].isna().any():
+                        col_mean = residue_stats[col].mean()
+                        residue_stats[col] = residue_stats[col].fillna(col_mean)
                         logger.warning(f"Filled NaN values in {col} with mean: {col_mean:.4f}")
 
             except Exception as e:
                 logger.error(f"Error processing residue column {res_col}: {str(e)}")
                 continue
 
+            derived_frames.append(residue_stats)
+            residue_derived_cols.extend(residue_stats.columns)
+
         # Add residue-derived columns to balance_cols
         balance_cols.extend([col for col in residue_derived_cols if col not in balance_cols])
 
-    # Get unique clusters and their sizes
-    group_sizes = df.groupby(group_col).size()
-    groups = list(group_sizes.index)
+    # Create a working copy of the dataframe for feature processing
+    working_df = df.copy()
+    if derived_frames:
+        derived_df = pd.concat(derived_frames, axis=1)
+        working_df[list(derived_df.columns)] = derived_df
+
+    # Encode clusters as int codes once (sorted, matching groupby order) so grouping and
+    # the final test mask work on integer arrays instead of hashing cluster labels again
+    group_codes, groups = pd.factorize(df[group_col], sort=True)
+    in_group = group_codes >= 0  # rows with a missing cluster label belong to no group
+    group_keys = group_codes[in_group]
+    group_sizes = np.bincount(group_keys, minlength=len(groups))
     total_size = len(df)
 
-    # For each property to balance, calculate the sum and variance components per group
-    group_properties = {}
-    group_variances = {}  # Store variance components per group
-    group_min_values = {}  # Store min values per property
-    group_max_values = {}  # Store max values per property
-
     # Process all columns to balance (original + derived)
-    for col in balance_cols:
+    value_cols = []
+    for col in dict.fromkeys(balance_cols):
         if col not in working_df.columns:
             logger.warning(f"Column '{col}' not found in working DataFrame, ignoring for balance")
             continue
+        value_cols.append(col)
 
-        # Calculate sum of values per group (for mean balancing)
-        group_properties[col] = working_df.groupby(group_col)[col].sum()
-
-        # Calculate values needed for variance balancing
-        global_mean = working_df[col].mean()
+    # Per-group statistics for every balanced column come from one groupby each, as
+    # (n_groups, n_cols) float matrices in the same group order as group_sizes
+    values = working_df[value_cols]
+    grouped = values[in_group].groupby(group_keys)
 
-        # For each group, calculate its contribution to variance
-        # Variance component = sum((x - global_mean)²)
-        variance_components = working_df.groupby(group_col)[col].apply(
-            lambda x: ((x - global_mean) ** 2).sum()
-        )
-        group_variances[col] = variance_components
-
-        # Find groups with min/max values for range balancing
-        group_min_values[col] = {}
-        group_max_values[col] = {}
-
-        # For each group, check if it contains min or max values
-        group_min = working_df.groupby(group_col)[col].min()
-        group_max = working_df.groupby(group_col)[col].max()
-
-        # Identify groups with values close to global min/max
-        global_min = working_df[col].min()
-        global_max = working_df[col].max()
-
-        # Flag groups having values within 5% of the global range to min/max
-        if global_max > global_min:
-            range_threshold = 0.05 * (global_max - global_min)
-            for group in groups:
-                if group in group_min and (group_min[group] - global_min) <= range_threshold:
-                    group_min_values[col][group] = 1
-                else:
-                    group_min_values[col][group] = 0
-
-                if group in group_max and (global_max - group_max[group]) <= range_threshold:
-                    group_max_values[col][group] = 1
-                else:
-                    group_max_values[col][group] = 0
-        else:
-            # Handle case where all values are the same (global_max == global_min)
-            for group in groups:
-                group_min_values[col][group] = 1
-                group_max_values[col][group] = 1
-
-    # Create the MILP problem
-    prob = LpProblem("ClusterSplit", LpMinimize)
-
-    # Decision variables (1 if group is in test set, 0 if in train set)
-    group_vars = {group: LpVariable(f"group_{i}", cat=LpBinary) for i, group in enumerate(groups)}
-
-    # Variable to represent absolute difference from target test size
-    size_deviation_var = LpVariable("size_deviation", lowBound=0)
-
-    # Calculate total for each property
-    property_totals = {col: group_prop.sum() for col, group_prop in group_properties.items()}
-    variance_totals = {col: variance_comp.sum() for col, variance_comp in group_variances.items()}
+    # Sum of values per group (for mean balancing)
+    group_sums = grouped.sum().to_numpy(dtype=float)
 
-    # Variables to represent absolute differences for property balances
-    balance_vars = {
-        col: LpVariable(f"balance_{col}", lowBound=0) for col in group_properties.keys()
-    }
-
-    # Variables to represent absolute differences for variance balances
-    variance_vars = {
-        col: LpVariable(f"variance_{col}", lowBound=0) for col in group_variances.keys()
-    }
-
-    # Variables to represent min/max range differences
-    min_range_vars = {
-        col: LpVariable(f"min_range_{col}", lowBound=0) for col in group_min_values.keys()
-    }
-    max_range_vars = {
-        col: LpVariable(f"max_range_{col}", lowBound=0) for col in group_max_values.keys()
-    }
+    # Variance component per group = sum((x - global_mean)²)
+    group_variances = (
+        ((values[in_group] - values.mean()) ** 2).groupby(group_keys).sum().to_numpy(dtype=float)
+    )
 
-    # Objective: minimize all deviations with their respective weights
-    objective_terms = [
-        size_deviation_var,  # Size deviation (weight 1.0)
-        balance_weight * lpSum(balance_vars.values()),  # Mean balance
-        variance_weight * lpSum(variance_vars.values()),  # Variance balance
-        range_weight
-        * lpSum(list(min_range_vars.values()) + list(max_range_vars.values())),  # Range balance
-    ]
+    # Flag groups having values within 5% of the global range to min/max; when all values
+    # are the same (global_max == global_min) every group is flagged
+    global_min = values.min()
+    global_max = values.max()
+    range_threshold = 0.05 * (global_max - global_min)
+    constant = ~(global_max > global_min)
+    group_min_flags = (((grouped.min() - global_min) <= range_threshold) | constant).to_numpy(
+        dtype=float
+    )
+    group_max_flags = (((global_max - grouped.max()) <= range_threshold) | constant).to_numpy(
+        dtype=float
+    )
 
-    prob += lpSum(objective_terms)
-
-    # Constraints for size deviation
-    target_test_count = test_size * total_size
-    test_count = lpSum([group_sizes[group] * group_vars[group] for group in groups])
-    prob += size_deviation_var >= test_count - target_test_count
-    prob += size_deviation_var >= target_test_count - test_count
-
-    # Constraints for property balance (mean)
-    for col, group_prop in group_properties.items():
-        test_prop_sum = lpSum([group_vars[group] * group_prop[group] for group in groups])
-        target_test_prop_sum = test_size * property_totals[col]
-        prob += balance_vars[col] >= test_prop_sum - target_test_prop_sum
-        prob += balance_vars[col] >= target_test_prop_sum - test_prop_sum
-
-    # Constraints for variance balance
-    for col, variance_comp in group_variances.items():
-        test_variance_sum = lpSum(
-            [group_vars[group] * variance_comp[group] for group in groups if group in variance_comp]
-        )
-        target_test_variance_sum = test_size * variance_totals[col]
-        prob += variance_vars[col] >= test_variance_sum - target_test_variance_sum
-        prob += variance_vars[col] >= target_test_variance_sum - test_variance_sum
-
-    # Constraints for min/max range balance
-    for col in group_min_values.keys():
-        # Count of min-range groups in test set
-        min_range_test_count = lpSum(
-            [
-                group_vars[group] * group_min_values[col][group]
-                for group in groups
-                if group in group_min_values[col]
-            ]
+    # Each balance term is a non-negative deviation variable bounded below by
+    # |sum(coefficients[g] * in_test[g]) - target|; the objective minimises their weighted sum
+    deviation_terms = [(1.0, group_sizes.astype(float), test_size * total_size)]
+    for coefficients in group_sums.T:
+        deviation_terms.append((balance_weight, coefficients, test_size * coefficients.sum()))
+    for coefficients in group_variances.T:
+        deviation_terms.append((variance_weight, coefficients, test_size * coefficients.sum()))
+    for j in range(len(value_cols)):
+        for flags in (group_min_flags, group_max_flags):
+            coefficients = flags[:, j]
+            # Without any flagged groups there is nothing to balance, only the variable remains
+            if coefficients.sum() > 0:
+                target = test_size * coefficients.sum()
+            else:
+                coefficients, target = None, 0.0
+            deviation_terms.append((range_weight, coefficients, target))
+
+    initial_test = None
+    if warm_start is True:
+        _, start_test_df = split(
+            df, group_col=group_col, test_size=test_size, random_state=random_state
         )
-        # Target proportion based on test_size
-        min_range_total = sum(group_min_values[col].values())
-        if min_range_total > 0:
-            target_min_range_test = test_size * min_range_total
-            prob += min_range_vars[col] >= min_range_test_count - target_min_range_test
-            prob += min_range_vars[col] >= target_min_range_test - min_range_test_count
-
-        # Count of max-range groups in test set
-        max_range_test_count = lpSum(
-            [
-                group_vars[group] * group_max_values[col][group]
-                for group in groups
-                if group in group_max_values[col]
-            ]
-        )
-        # Target proportion based on test_size
-        max_range_total = sum(group_max_values[col].values())
-        if max_range_total > 0:
-            target_max_range_test = test_size * max_range_total
-            prob += max_range_vars[col] >= max_range_test_count - target_max_range_test
-            prob += max_range_vars[col] >= target_max_range_test - max_range_test_count
-
-    # Try to configure solver with time limit
-    from pulp import COIN_CMD, PulpSolverError
-
-    logger.info(f"Attempting to set MILP solver time limit to {time_limit} seconds")
+        warm_start = start_test_df[group_col]
+    if warm_start is not None and warm_start is not False:
+        initial_test = np.asarray(groups.isin(warm_start))
+        logger.info(f"Warm-starting MILP with {initial_test.sum()} groups in the test set")
 
-    # Try different solver options in order of preference
-    solver = None
-
-    if logger.level <= logging.INFO:
-        # Option 1: Try PuLP's CBC CMD interface
+    in_test = None
+    if solver in ("auto", "highs"):
         try:
-            solver = PULP_CBC_CMD(timeLimit=time_limit)
-            prob.solve(solver)
-        except PulpSolverError as e:
-            logger.warning(f"CBC solver not available: {e}")
-            solver = None
-
-        # Option 2: Try COIN_CMD if available (needs coinor-cbc installed)
-        if solver is None:
-            try:
-                logger.info("Trying COIN_CMD solver")
-                solver = COIN_CMD(timeLimit=time_limit)
-                prob.solve(solver)
-            except (PulpSolverError, Exception) as e:
-                logger.warning(f"COIN_CMD solver not available: {e}")
-                solver = None
-
-        # Option 3: Fall back to default solver with no time limit
-        if solver is None:
-            logger.warning(
-                "No time-limited solver available. Using default solver without time limit."
-            )
-            logger.warning("To enable time limits, install CBC solver: pip install pulp[cbc]")
-            prob.solve()
-    else:
-        # Run solvers silently at WARNING or higher levels
-        try:
-            solver = PULP_CBC_CMD(timeLimit=time_limit, msg=False)
-            prob.solve(solver)
-        except PulpSolverError:
-            try:
-                solver = COIN_CMD(timeLimit=time_limit, msg=False)
-                prob.solve(solver)
-            except (PulpSolverError, Exception):
-                prob.solve(PULP_CBC_CMD(msg=False))
-
-    logger.info(f"MILP solution status: {LpStatus[prob.status]}")
-
-    if prob.status != 1:  # Not optimal
-        logger.warning("MILP solution not optimal, using best found solution")
-
-    # Extract results
-    test_groups = [group for group, var in group_vars.items() if value(var) > 0.5]
+            in_test = _solve_split_highs(len(groups), deviation_terms, time_limit)
+        except ImportError:
+            if solver == "highs":
+                raise
+            logger.info("scipy.optimize.milp not available, solving with PuLP")
+        if in_test is None and solver == "highs":
+            raise RuntimeError(f"HiGHS found no feasible split within {time_limit} seconds")
+    if in_test is None:
+        in_test = _solve_split_pulp(len(groups), deviation_terms, time_limit, initial_test)
+
+    # A time-limited solve can stop at an incumbent worse than the starting solution
+    if initial_test is not None:
+        start_objective = _split_objective(initial_test, deviation_terms)
+        if start_objective < _split_objective(in_test, deviation_terms):
+            logger.warning("MILP solution balances worse than the warm start, keeping the start")
+            in_test = initial_test
 
     # Create train and test DataFrames (using original dataframe)
-    test_df = df[df[group_col].isin(test_groups)]
-    train_df = df[~df[group_col].isin(test_groups)]
+    test_mask = np.zeros(len(df), dtype=bool)
+    test_mask[in_group] = in_test[group_keys]
+    test_df = df[test_mask]
+    train_df = df[~test_mask]
 
     # Report results
     achieved_test_fraction = len(test_df) / total_size
@@ -935,22 +1110,13 @@ def milp_split(
             train_dist = train_df[cat_col].value_counts(normalize=True)
             test_dist = test_df[cat_col].value_counts(normalize=True)
 
-            # Ensure both distributions have the same categories
-            all_cats = set(train_dist.index).union(set(test_dist.index))
-            for cat in all_cats:
-                if cat not in train_dist:
-                    train_dist[cat] = 0
-                if cat not in test_dist:
-                    test_dist[cat] = 0
-
-            # Sort by category name
-            train_dist = train_dist.sort_index()
-            test_dist = test_dist.sort_index()
-
-            # Calculate distribution difference
-            dist_diff = (
-                np.sum(np.abs(train_dist.values - test_dist.values)) / 2
-            )  # Jensen-Shannon divergence simplification
+            # Align both distributions on the same (sorted) categories
+            all_cats = train_dist.index.union(test_dist.index)
+            train_dist = train_dist.reindex(all_cats, fill_value=0)
+            test_dist = test_dist.reindex(all_cats, fill_value=0)
+
+            # Calculate distribution difference (total variation distance)
+            dist_diff = np.abs(train_dist.to_numpy() - test_dist.to_numpy()).sum() / 2
 
             logger.info(f"Categorical property '{cat_col}':")
             logger.info(f"  Train distribution: {dict(train_dist)}")
@@ -1,3 +1,4 @@
+import functools
 import shutil
 
 import numpy as np
@@ -26,9 +27,13 @@ def check_random_state(random_state):
     raise ValueError(f"random_state must be None, int, or RandomState, got {type(random_state)}")
 
 
+@functools.lru_cache(maxsize=1)
 def _check_mmseqs():
     """
     Ensures 'mmseqs' command is in PATH.
+
+    A successful lookup is cached for the rest of the session; failures are not cached,
+    so installing MMseqs2 after a failed check is picked up on the next call.
     """
     logger.debug("Checking if MMseqs2 is installed")
     if shutil.which("mmseqs") is None:
@@ -38,6 +43,7 @@ def _check_mmseqs():
             "See the README for installation instructions."
         )
     logger.debug("MMseqs2 found in PATH")
+    return True
 
 
 def _validate_clustering_params(
@@ -16,11 +16,13 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 TAPE_FLUORESCENCE_PATH = os.path.join(DATA_DIR, "fluorescence.json")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fluorescence_data():
     """
     Load the first 400 proteins from the TAPE fluorescence dataset.
     The dataset should be in JSON format with at least 'sequence' and 'fluorescence' fields.
+
+    Loaded once per test session, so tests must copy it before modifying it.
     """
     if not os.path.exists(TAPE_FLUORESCENCE_PATH):
         pytest.skip(f"TAPE fluorescence data not found at {TAPE_FLUORESCENCE_PATH}")
@@ -47,6 +49,37 @@ def fluorescence_data():
     return df
 
 
+@pytest.fixture(scope="session")
+def clustered_fluorescence(fluorescence_data, mmseqs_installed):
+    """
+    Fluorescence data clustered once per test session at 99% identity and 80% coverage,
+    with the fast high-identity prefilter settings.
+
+    Shared across tests, so tests must copy it before modifying it. When pyarrow is
+    installed, the 'id' and 'representative_sequence' key columns are stored as
+    Arrow-backed strings, which the splitting tests group and hash repeatedly.
+    """
+    from importlib.util import find_spec
+
+    from protclust import cluster
+
+    df = cluster(
+        fluorescence_data,
+        sequence_col="sequence",
+        id_col="id",
+        min_seq_id=0.99,
+        coverage=0.8,
+        sensitivity="auto",
+        max_rejected=5,
+    )
+
+    if find_spec("pyarrow") is not None:
+        for col in ["id", "representative_sequence"]:
+            df[col] = df[col].astype("string[pyarrow]")
+
+    return df
+
+
 @pytest.fixture
 def synthetic_cluster_data():
     """
@@ -128,7 +161,7 @@ def challenging_protein_data():
     return create_challenging_dataset()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mmseqs_installed():
     """Skip tests if MMseqs2 is not installed."""
     import shutil
@@ -138,6 +171,26 @@ def mmseqs_installed():
     return True
 
 
+@pytest.fixture
+def mmseqs_commands(monkeypatch):
+    """
+    Record every command passed to subprocess.run while still running it.
+
+    Returns the list of recorded commands, in call order.
+    """
+    import subprocess
+
+    commands = []
+    real_run = subprocess.run
+
+    def recording_run(cmd, *args, **kwargs):
+        commands.append(cmd)
+        return real_run(cmd, *args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "run", recording_run)
+    return commands
+
+
 @pytest.fixture(autouse=True)
 def test_logger():
     """Set up test logger and suppress warnings during tests."""
@@ -202,3 +202,245 @@ def test_cluster_reproducibility(mmseqs_installed):
         import warnings
 
         warnings.warn(f"Optional non-determinism check failed: {str(e)}")
+
+
+def test_cluster_many(synthetic_cluster_data, mmseqs_installed):
+    """Test clustering several DataFrames with a single MMseqs2 run."""
+    from protclust import cluster_many
+
+    df = synthetic_cluster_data
+    first = df.iloc[: len(df) // 2]
+    second = df.iloc[len(df) // 2 :]
+
+    results = cluster_many(
+        [first, second], sequence_col="sequence", id_col="id", min_seq_id=0.5, random_state=42
+    )
+
+    assert len(results) == 2
+    for original, result in zip([first, second], results):
+        # Rows, order and index are preserved
+        assert result.index.equals(original.index)
+        assert result["id"].tolist() == original["id"].tolist()
+        # Representatives are original IDs from one of the inputs
+        assert set(result["representative_sequence"]).issubset(set(df["id"]))
+
+    # Joint clustering should match clustering the concatenated input directly
+    joint = cluster(df, sequence_col="sequence", id_col="id", min_seq_id=0.5, random_state=42)
+    combined = (
+        results[0]["representative_sequence"].tolist()
+        + results[1]["representative_sequence"].tolist()
+    )
+    assert combined == joint.loc[df.index, "representative_sequence"].tolist()
+
+
+def test_cluster_threads_and_sensitivity(synthetic_cluster_data, mmseqs_installed, mmseqs_commands):
+    """Test that threads and sensitivity are forwarded to MMseqs2."""
+    import pytest
+
+    result = cluster(
+        synthetic_cluster_data, sequence_col="sequence", id_col="id", threads=2, sensitivity=4.0
+    )
+    assert "representative_sequence" in result.columns
+
+    cmd = mmseqs_commands[-1]
+    assert cmd[cmd.index("--threads") + 1] == "2"
+    assert cmd[cmd.index("-s") + 1] == "4.0"
+
+    with pytest.raises(ValueError, match="threads"):
+        cluster(synthetic_cluster_data, sequence_col="sequence", id_col="id", threads=0)
+
+
+def test_cluster_linclust(synthetic_cluster_data, mmseqs_installed, mmseqs_commands):
+    """Test clustering with the linear-time easy-linclust workflow."""
+    import pytest
+
+    result = cluster(
+        synthetic_cluster_data,
+        sequence_col="sequence",
+        id_col="id",
+        min_seq_id=0.9,
+        algorithm="linclust",
+    )
+    assert len(result) == len(synthetic_cluster_data)
+    assert result["representative_sequence"].isin(result["id"]).all()
+
+    cmd = mmseqs_commands[-1]
+    assert cmd[1] == "easy-linclust"
+    assert "--cluster-steps" not in cmd
+
+    with pytest.raises(ValueError, match="algorithm"):
+        cluster(synthetic_cluster_data, sequence_col="sequence", id_col="id", algorithm="blast")
+
+
+def test_cluster_reuse_db(synthetic_cluster_data, mmseqs_installed, mmseqs_commands):
+    """Test that reuse_db skips createdb on repeated runs without changing results."""
+    expected = cluster(
+        synthetic_cluster_data, sequence_col="sequence", id_col="id", random_state=42
+    )
+
+    results = []
+    for min_seq_id in [0.3, 0.3, 0.5]:
+        mmseqs_commands.clear()
+        results.append(
+            cluster(
+                synthetic_cluster_data,
+                sequence_col="sequence",
+                id_col="id",
+                min_seq_id=min_seq_id,
+                random_state=42,
+                reuse_db=True,
+            )
+        )
+        subcommands = [cmd[1] for cmd in mmseqs_commands]
+        assert "cluster" in subcommands and "createtsv" in subcommands
+        if len(results) > 1:
+            assert "createdb" not in subcommands
+
+    assert results[0]["representative_sequence"].equals(expected["representative_sequence"])
+    assert results[1]["representative_sequence"].equals(expected["representative_sequence"])
+
+
+def test_cluster_reuse_db_eviction(
+    synthetic_cluster_data, mmseqs_installed, mmseqs_commands, monkeypatch, tmp_path
+):
+    """Test that cached sequence databases are bounded and kept under tmp_dir."""
+    from collections import Counter, OrderedDict
+
+    from protclust import clustering
+
+    monkeypatch.setattr(clustering, "_DB_CACHE_SIZE", 1)
+    monkeypatch.setattr(clustering, "_db_cache", OrderedDict())
+    monkeypatch.setattr(clustering, "_db_cache_users", Counter())
+
+    inputs = [synthetic_cluster_data, synthetic_cluster_data.iloc[:-1]]
+    for df in inputs + inputs[:1]:
+        mmseqs_commands.clear()
+        cluster(df, sequence_col="sequence", id_col="id", reuse_db=True, tmp_dir=str(tmp_path))
+        # Only one database fits, so every switch of input rebuilds it
+        assert "createdb" in [cmd[1] for cmd in mmseqs_commands]
+
+    cache_dir = tmp_path / clustering._DB_CACHE_DIR_NAME
+    assert len(list(cache_dir.iterdir())) == 1
+    assert len(clustering._db_cache) == 1 and not clustering._db_cache_users
+
+    clustering._clear_db_cache()
+    assert not list(cache_dir.iterdir())
+
+
+def test_cluster_prefilter_tuning(synthetic_cluster_data, mmseqs_installed, mmseqs_commands):
+    """Test automatic sensitivity and alignment limits passed to MMseqs2."""
+    import pytest
+
+    for min_seq_id, expected_s in [(0.95, "1.0"), (0.5, "3.5"), (0.3, "6.0")]:
+        cluster(
+            synthetic_cluster_data,
+            sequence_col="sequence",
+            id_col="id",
+            min_seq_id=min_seq_id,
+            sensitivity="auto",
+            max_seqs=20,
+            max_rejected=5,
+        )
+        cmd = mmseqs_commands[-1]
+        assert cmd[cmd.index("-s") + 1] == expected_s
+        assert cmd[cmd.index("--max-seqs") + 1] == "20"
+        assert cmd[cmd.index("--max-rejected") + 1] == "5"
+        assert "--max-accept" not in cmd
+
+    # High-identity tuning keeps the clusters of the default settings
+    default = cluster(synthetic_cluster_data, sequence_col="sequence", id_col="id", min_seq_id=0.9)
+    tuned = cluster(
+        synthetic_cluster_data,
+        sequence_col="sequence",
+        id_col="id",
+        min_seq_id=0.9,
+        sensitivity="auto",
+        max_rejected=5,
+    )
+    assert tuned["representative_sequence"].equals(default["representative_sequence"])
+
+    with pytest.raises(ValueError, match="max_accept"):
+        cluster(synthetic_cluster_data, sequence_col="sequence", id_col="id", max_accept=0)
+    with pytest.raises(ValueError, match="sensitivity"):
+        cluster(synthetic_cluster_data, sequence_col="sequence", id_col="id", sensitivity="fast")
+
+
+def test_cluster_parallel(synthetic_cluster_data, mmseqs_installed):
+    """Test running a parameter sweep of cluster() calls concurrently."""
+    from protclust import cluster_parallel
+
+    thresholds = [0.3, 0.5, 0.9]
+    params_list = [
+        {
+            "df": synthetic_cluster_data,
+            "sequence_col": "sequence",
+            "id_col": "id",
+            "min_seq_id": min_seq_id,
+            "random_state": 42,
+        }
+        for min_seq_id in thresholds
+    ]
+
+    results = cluster_parallel(params_list, max_workers=2)
+
+    assert len(results) == len(thresholds)
+    for params, result in zip(params_list, results):
+        expected = cluster(**params)
+        assert result["representative_sequence"].equals(expected["representative_sequence"])
+
+
+def test_cluster_overlapped_tsv_parsing(synthetic_cluster_data, mmseqs_installed, monkeypatch):
+    """Test that the overlapped MMseqs2 run matches the blocking run."""
+    import protclust.clustering as clustering
+
+    params = dict(sequence_col="sequence", id_col="id", min_seq_id=0.5, random_state=42)
+    expected = cluster(synthetic_cluster_data, **params)
+
+    # Force the Popen-based path used for large inputs
+    monkeypatch.setattr(clustering, "_OVERLAP_MIN_SEQUENCES", 1)
+    result = cluster(synthetic_cluster_data, **params)
+
+    assert result["representative_sequence"].equals(expected["representative_sequence"])
+
+
+def test_cluster_overlapped_tsv_written_last(synthetic_cluster_data, tmp_path, monkeypatch):
+    """Test that the overlapped run waits for the TSV, which MMseqs2 moves into place last."""
+    import os
+    import threading
+
+    import protclust.clustering as clustering
+
+    # Stub following the easy-cluster output order: FASTA files, then the TSV, then cleanup
+    stub = tmp_path / "mmseqs"
+    stub.write_text(
+        "#!/bin/sh\n"
+        'input="$2"; results="$3"; tmp="$4"\n'
+        'mkdir -p "$tmp"\n'
+        'awk \'/^>/ { id = substr($1, 2); print id "\\t" id }\' "$input" > "$tmp/cluster.tsv"\n'
+        'cp "$input" "$tmp/all_seqs.fasta"\n'
+        'cp "$input" "$tmp/rep_seq.fasta"\n'
+        'mv "$tmp/all_seqs.fasta" "${results}_all_seqs.fasta"\n'
+        'mv "$tmp/rep_seq.fasta" "${results}_rep_seq.fasta"\n'
+        "sleep 0.5\n"
+        'mv "$tmp/cluster.tsv" "${results}_cluster.tsv"\n'
+        "sleep 0.5\n"
+    )
+    stub.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(clustering, "_OVERLAP_MIN_SEQUENCES", 1)
+
+    parse_threads = []
+    real_read = clustering._read_cluster_tsv
+
+    def recording_read(clusters_file):
+        parse_threads.append(threading.current_thread())
+        return real_read(clusters_file)
+
+    monkeypatch.setattr(clustering, "_read_cluster_tsv", recording_read)
+
+    result = cluster(synthetic_cluster_data, sequence_col="sequence", id_col="id")
+
+    # Parsed once, in the background thread, while the stub was still running
+    assert len(parse_threads) == 1
+    assert parse_threads[0] is not threading.main_thread()
+    assert result["representative_sequence"].equals(result["id"])
@@ -1,5 +1,6 @@
 """Tests for constrained splitting functionality using realistic protein data."""
 
+import numpy as np
 import pytest
 
 from protclust import cluster, constrained_split
@@ -45,10 +46,10 @@ def test_constrained_split_basic(realistic_protein_data, mmseqs_installed):
     )
 
     # Check that forced IDs are in the correct sets
-    assert all(id_val in train_df["id"].values for id_val in train_ids), (
+    assert np.isin(train_ids, train_df["id"].to_numpy()).all(), (
         "Not all forced train IDs are in the train set"
     )
-    assert all(id_val in test_df["id"].values for id_val in test_ids), (
+    assert np.isin(test_ids, test_df["id"].to_numpy()).all(), (
         "Not all forced test IDs are in the test set"
     )
 
@@ -262,3 +263,26 @@ def test_constrained_split_extreme_case(realistic_protein_data, mmseqs_installed
 
     forced_pct = len(set(force_train_clusters) & train_clusters) / len(force_train_clusters)
     assert forced_pct == 1.0, f"Only {forced_pct:.2%} of forced train clusters are in train set"
+
+
+def test_constrained_split_exact_test_count():
+    """Test that forced test sequences count towards one whole-sequence test target."""
+    import pandas as pd
+
+    # One 3-sequence cluster plus 22 singletons, so every test count is achievable
+    groups = ["cluster_0"] * 3 + [f"cluster_{i}" for i in range(1, 23)]
+    df = pd.DataFrame({"id": [f"seq_{i}" for i in range(len(groups))], "group": groups})
+
+    train_df, test_df = constrained_split(
+        df,
+        group_col="group",
+        id_col="id",
+        test_size=0.3,
+        force_test_ids=["seq_0"],
+        random_state=42,
+    )
+
+    # round(0.3 * 25) = 8 test sequences: the forced cluster of 3 plus 5 others
+    assert len(test_df) == 8
+    assert len(train_df) == 17
+    assert set(df["id"][:3]) <= set(test_df["id"])
@@ -7,6 +7,7 @@ import pandas as pd
 import pytest
 
 from protclust import clean, cluster, split
+from protclust.utils import _check_mmseqs
 
 
 def test_invalid_sequence_input(challenging_protein_data):
@@ -91,6 +92,7 @@ def test_mmseqs_missing(realistic_protein_data, monkeypatch):
         return shutil.which(cmd)
 
     monkeypatch.setattr(shutil, "which", mock_which)
+    _check_mmseqs.cache_clear()
 
     # Attempt clustering, should raise EnvironmentError
     with pytest.raises(Exception) as excinfo:
@@ -249,8 +251,6 @@ def test_mmseqs_not_found(monkeypatch):
     """Test error handling when mmseqs is not found."""
     import shutil
 
-    from protclust.utils import _check_mmseqs
-
     # Mock shutil.which to simulate mmseqs not being found
     def mock_which(cmd):
         if cmd == "mmseqs":
@@ -258,6 +258,7 @@ def test_mmseqs_not_found(monkeypatch):
         return shutil.which(cmd)
 
     monkeypatch.setattr(shutil, "which", mock_which)
+    _check_mmseqs.cache_clear()
 
     # Check that it raises the appropriate error
     with pytest.raises(EnvironmentError, match="MMseqs2 is not installed"):
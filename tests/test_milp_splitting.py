@@ -1,6 +1,7 @@
 """Tests for MILP-based splitting functionality with detailed property balance verification."""
 
 import numpy as np
+import pandas as pd
 
 from protclust import cluster, milp_split
 
@@ -254,3 +255,143 @@ def test_milp_time_limit(realistic_protein_data, mmseqs_installed):
     assert short_time < long_time or abs(short_time - long_time) < 0.5, (
         f"Time limits not reflected in runtime: short={short_time:.2f}s, long={long_time:.2f}s"
     )
+
+
+def test_milp_solvers(realistic_protein_data, mmseqs_installed):
+    """Test that the HiGHS and CBC solvers both produce valid balanced splits."""
+    import pytest
+
+    clustered_df = cluster(
+        realistic_protein_data, sequence_col="sequence", id_col="id", min_seq_id=0.8
+    )
+
+    for solver in ["highs", "cbc"]:
+        train_df, test_df = milp_split(
+            clustered_df,
+            group_col="representative_sequence",
+            test_size=0.3,
+            balance_cols=["molecular_weight"],
+            time_limit=5,
+            solver=solver,
+        )
+
+        assert len(train_df) + len(test_df) == len(clustered_df)
+        assert set(train_df["representative_sequence"]).isdisjoint(
+            set(test_df["representative_sequence"])
+        )
+        assert len(train_df) > 0 and len(test_df) > 0
+
+    with pytest.raises(ValueError, match="solver"):
+        milp_split(clustered_df, group_col="representative_sequence", solver="gurobi")
+
+
+def test_milp_residue_and_categorical_columns():
+    """Test MILP balancing with categorical and per-residue columns."""
+    rng = np.random.default_rng(42)
+    n = 120
+    df = pd.DataFrame(
+        {
+            "representative_sequence": [f"cluster_{i % 20}" for i in range(n)],
+            "label": rng.choice(["alpha", "beta"], n),
+            "scores": [rng.normal(size=rng.integers(2, 40)) for _ in range(n)],
+        }
+    )
+
+    train_df, test_df = milp_split(
+        df,
+        group_col="representative_sequence",
+        test_size=0.25,
+        categorical_cols=["label"],
+        residue_cols=["scores"],
+        time_limit=5,
+    )
+
+    assert len(train_df) + len(test_df) == n
+    assert len(test_df) > 0
+    assert set(train_df["representative_sequence"]).isdisjoint(
+        set(test_df["representative_sequence"])
+    )
+    # Derived balance columns must not leak into the returned frames
+    assert list(test_df.columns) == list(df.columns)
+
+
+def test_milp_cbc_similar_column_names():
+    """Test that CBC handles columns whose names only differ in characters PuLP rewrites."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "representative_sequence": np.arange(60) % 15,
+            "net charge": rng.normal(size=60),
+            "net_charge": rng.normal(size=60),
+        }
+    )
+
+    train_df, test_df = milp_split(
+        df,
+        group_col="representative_sequence",
+        balance_cols=["net charge", "net_charge"],
+        time_limit=5,
+        solver="cbc",
+    )
+
+    assert len(train_df) + len(test_df) == len(df)
+    assert len(test_df) > 0
+
+
+def test_milp_warm_start():
+    """Test that warm-started MILP splits are valid and balance at least as well as the start."""
+    from protclust import split
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "representative_sequence": rng.integers(0, 150, 600).astype(str),
+            "score": rng.lognormal(size=600),
+        }
+    )
+    _, naive_test = split(df, group_col="representative_sequence", test_size=0.3, random_state=0)
+
+    def mean_gap(train_df, test_df):
+        return abs(train_df["score"].mean() - test_df["score"].mean())
+
+    naive_gap = mean_gap(df.drop(naive_test.index), naive_test)
+
+    for solver in ["highs", "cbc"]:
+        for warm_start in [True, naive_test["representative_sequence"]]:
+            train_df, test_df = milp_split(
+                df,
+                group_col="representative_sequence",
+                test_size=0.3,
+                balance_cols=["score"],
+                variance_weight=0.0,
+                range_weight=0.0,
+                time_limit=5,
+                random_state=0,
+                solver=solver,
+                warm_start=warm_start,
+            )
+
+            assert len(train_df) + len(test_df) == len(df)
+            assert set(train_df["representative_sequence"]).isdisjoint(
+                set(test_df["representative_sequence"])
+            )
+            assert mean_gap(train_df, test_df) <= naive_gap
+
+
+def test_milp_highs_without_solution(monkeypatch):
+    """Test that "highs" raises when HiGHS finds no split, while "auto" falls back to CBC."""
+    import pytest
+
+    import protclust.splitting
+
+    monkeypatch.setattr(protclust.splitting, "_solve_split_highs", lambda *args: None)
+    df = pd.DataFrame(
+        {"representative_sequence": np.arange(40) % 10, "score": np.arange(40, dtype=float)}
+    )
+
+    with pytest.raises(RuntimeError, match="HiGHS"):
+        milp_split(df, balance_cols=["score"], time_limit=5, solver="highs")
+
+    train_df, test_df = milp_split(df, balance_cols=["score"], time_limit=5, solver="auto")
+    assert len(train_df) + len(test_df) == len(df)
+    assert len(test_df) > 0
@@ -1,6 +1,6 @@
 """Tests for split integrity using synthetic data with predictable patterns."""
 
-from protclust import cluster, split, train_test_cluster_split
+from protclust import cluster, constrained_split, split, train_test_cluster_split
 
 
 def test_basic_split_integrity(synthetic_cluster_data, mmseqs_installed):
@@ -183,3 +183,41 @@ def test_split_with_property_distribution(synthetic_cluster_data, mmseqs_install
     assert abs(test_mean - overall_mean) < overall_std, (
         f"Test set property mean ({test_mean:.2f}) differs too much from overall ({overall_mean:.2f})"
     )
+
+
+def test_split_methods():
+    """Test greedy, DP, and auto group selection in split()."""
+    import pandas as pd
+    import pytest
+
+    # Group sizes 10, 9, ..., 1 (55 rows)
+    groups = [f"group_{size}" for size in range(10, 0, -1) for _ in range(size)]
+    df = pd.DataFrame({"group": groups, "value": range(len(groups))})
+
+    for method in ["greedy", "dp", "auto"]:
+        train_df, test_df = split(
+            df, group_col="group", test_size=0.3, random_state=42, method=method
+        )
+        assert len(train_df) + len(test_df) == len(df)
+        assert set(train_df["group"]).isdisjoint(set(test_df["group"]))
+        assert abs(len(test_df) / len(df) - 0.3) <= 0.05
+
+    # DP reaches the closest achievable size (round(0.3 * 55) = 16)
+    _, test_df = split(df, group_col="group", test_size=0.3, random_state=42, method="dp")
+    assert len(test_df) == 16
+
+    # Rows without a group label are never selected; with no groups at all, all rows train
+    unlabeled = pd.DataFrame({"group": [None] * 5, "value": range(5)})
+    for method in ["greedy", "dp", "auto"]:
+        train_df, test_df = split(
+            unlabeled, group_col="group", test_size=0.3, random_state=42, method=method
+        )
+        assert len(train_df) == 5
+        assert len(test_df) == 0
+
+    with pytest.raises(ValueError, match="method"):
+        split(df, group_col="group", test_size=0.3, method="invalid")
+
+    # Wrappers forward method to split()
+    with pytest.raises(ValueError, match="method"):
+        constrained_split(df, group_col="group", test_size=0.3, id_type="group", method="invalid")
@@ -4,7 +4,6 @@ import numpy as np
 import pytest
 
 from protclust import (
-    cluster,
     cluster_kfold,
     constrained_split,
     milp_split,
@@ -13,6 +12,8 @@ from protclust import (
     train_test_val_cluster_split,
 )
 
+from .test_utils import disjoint
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,18 +34,26 @@ def test_split_data(fluorescence_data):
     assert len(train_df) + len(test_df) == len(df)
 
     # Check that groups are preserved (no group appears in both train and test)
-    train_groups = set(train_df["group"])
-    test_groups = set(test_df["group"])
-    assert len(train_groups.intersection(test_groups)) == 0
+    assert disjoint(train_df["group"], test_df["group"])
 
     # Check approximate test size
     test_ratio = len(test_df) / len(df)
     assert 0.25 <= test_ratio <= 0.35  # Allow some flexibility due to group constraints
 
+    # Subset-sum selection must hit the closest achievable test size exactly; with 10 groups
+    # every subset can be enumerated to find it
+    group_sizes = df["group"].value_counts().to_numpy()
+    subsets = (np.arange(2 ** len(group_sizes))[:, None] >> np.arange(len(group_sizes))) & 1
+    target_test_count = round(0.3 * len(df))
+    best_gap = np.abs(subsets @ group_sizes - target_test_count).min()
+
+    _, dp_test_df = split(df, group_col="group", test_size=0.3, method="dp")
+    assert abs(len(dp_test_df) - target_test_count) == best_gap
+
 
 def test_train_test_cluster_split(fluorescence_data, mmseqs_installed):
     """Test combined clustering and splitting."""
-    df = fluorescence_data.copy()
+    df = fluorescence_data
 
     # Run combined function
     train_df, test_df = train_test_cluster_split(
@@ -64,9 +73,7 @@ def test_train_test_cluster_split(fluorescence_data, mmseqs_installed):
     assert "representative_sequence" in test_df.columns
 
     # Check that clusters are preserved (no cluster appears in both train and test)
-    train_clusters = set(train_df["representative_sequence"])
-    test_clusters = set(test_df["representative_sequence"])
-    assert len(train_clusters.intersection(test_clusters)) == 0
+    assert disjoint(train_df["representative_sequence"], test_df["representative_sequence"])
 
     # Check approximate test size
     test_ratio = len(test_df) / len(df)
@@ -75,7 +82,7 @@ def test_train_test_cluster_split(fluorescence_data, mmseqs_installed):
 
 def test_train_test_val_cluster_split(fluorescence_data, mmseqs_installed):
     """Test three-way splitting."""
-    df = fluorescence_data.copy()
+    df = fluorescence_data
 
     # Run three-way split
     train_df, val_df, test_df = train_test_val_cluster_split(
@@ -92,13 +99,13 @@ def test_train_test_val_cluster_split(fluorescence_data, mmseqs_installed):
     assert len(train_df) + len(val_df) + len(test_df) == len(df)
 
     # Check that clusters are preserved (no cluster appears in multiple splits)
-    train_clusters = set(train_df["representative_sequence"])
-    val_clusters = set(val_df["representative_sequence"])
-    test_clusters = set(test_df["representative_sequence"])
+    train_clusters = train_df["representative_sequence"]
+    val_clusters = val_df["representative_sequence"]
+    test_clusters = test_df["representative_sequence"]
 
-    assert len(train_clusters.intersection(val_clusters)) == 0
-    assert len(train_clusters.intersection(test_clusters)) == 0
-    assert len(val_clusters.intersection(test_clusters)) == 0
+    assert disjoint(train_clusters, val_clusters)
+    assert disjoint(train_clusters, test_clusters)
+    assert disjoint(val_clusters, test_clusters)
 
     # Check approximate split sizes
     total = len(df)
@@ -107,12 +114,9 @@ def test_train_test_val_cluster_split(fluorescence_data, mmseqs_installed):
     assert 0.65 <= len(train_df) / total <= 0.75
 
 
-def test_constrained_split(fluorescence_data, mmseqs_installed):
+def test_constrained_split(clustered_fluorescence):
     """Test constrained splitting."""
-    df = fluorescence_data.copy()
-
-    # First cluster the data
-    clustered_df = cluster(df, sequence_col="sequence", id_col="id", min_seq_id=0.99, coverage=0.8)
+    clustered_df = clustered_fluorescence
 
     # Force specific IDs to train and test sets
     force_train_ids = [clustered_df.loc[0, "id"]]
@@ -133,18 +137,16 @@ def test_constrained_split(fluorescence_data, mmseqs_installed):
     assert len(train_df) + len(test_df) == len(clustered_df)
 
     # Check that forced IDs are in the correct sets
-    assert all(id_val in train_df["id"].values for id_val in force_train_ids)
-    assert all(id_val in test_df["id"].values for id_val in force_test_ids)
+    assert np.isin(force_train_ids, train_df["id"].to_numpy()).all()
+    assert np.isin(force_test_ids, test_df["id"].to_numpy()).all()
 
     # Check that groups are preserved
-    train_clusters = set(train_df["representative_sequence"])
-    test_clusters = set(test_df["representative_sequence"])
-    assert len(train_clusters.intersection(test_clusters)) == 0
+    assert disjoint(train_df["representative_sequence"], test_df["representative_sequence"])
 
 
 def test_cluster_kfold(fluorescence_data, mmseqs_installed):
     """Test k-fold cross-validation with clustering."""
-    df = fluorescence_data.copy()
+    df = fluorescence_data
 
     # Run k-fold
     n_splits = 4
@@ -167,22 +169,22 @@ def test_cluster_kfold(fluorescence_data, mmseqs_installed):
         assert len(train_df) + len(test_df) == len(df)
 
         # Check that clusters are preserved
-        train_clusters = set(train_df["representative_sequence"])
-        test_clusters = set(test_df["representative_sequence"])
-        assert len(train_clusters.intersection(test_clusters)) == 0
+        assert disjoint(train_df["representative_sequence"], test_df["representative_sequence"])
 
 
-def test_milp_split(fluorescence_data, mmseqs_installed):
+def test_milp_split(clustered_fluorescence):
     """Test MILP-based splitting with balanced properties and distribution similarity."""
     try:
         pass
     except ImportError:
         pytest.skip("PuLP not installed, skipping MILP test")
 
-    df = fluorescence_data.copy()
+    clustered_df = clustered_fluorescence
 
-    # First cluster the data
-    clustered_df = cluster(df, sequence_col="sequence", id_col="id", min_seq_id=0.99, coverage=0.8)
+    # Naive split for comparison, also used as the solver's starting solution
+    naive_train, naive_test = split(
+        clustered_df, group_col="representative_sequence", test_size=0.3
+    )
 
     # Run MILP split with distribution similarity, balancing fluorescence
     train_df, test_df = milp_split(
@@ -194,15 +196,14 @@ def test_milp_split(fluorescence_data, mmseqs_installed):
         variance_weight=1.0,
         time_limit=10,
         range_weight=1.0,
+        warm_start=naive_test["representative_sequence"],
     )
 
     # Check that all samples are accounted for
     assert len(train_df) + len(test_df) == len(clustered_df)
 
     # Check that groups are preserved (no cluster appears in both splits)
-    train_groups = set(train_df["representative_sequence"])
-    test_groups = set(test_df["representative_sequence"])
-    assert len(train_groups.intersection(test_groups)) == 0
+    assert disjoint(train_df["representative_sequence"], test_df["representative_sequence"])
 
     # Check approximate test size
     test_ratio = len(test_df) / len(clustered_df)
@@ -235,11 +236,6 @@ def test_milp_split(fluorescence_data, mmseqs_installed):
         f"  Range: train=[{train_min:.4f}, {train_max:.4f}], test=[{test_min:.4f}, {test_max:.4f}], overall=[{overall_min:.4f}, {overall_max:.4f}]"
     )
 
-    # For comparison, perform a naive split and check balance
-    naive_train, naive_test = split(
-        clustered_df, group_col="representative_sequence", test_size=0.3
-    )
-
     # Calculate distribution statistics for naive split
     naive_train_mean = naive_train["fluorescence"].mean()
     naive_test_mean = naive_test["fluorescence"].mean()
@@ -320,40 +316,36 @@ def test_enhanced_milp_split(fluorescence_data, protein_data=None):
 
     # If no protein data provided, use a small synthetic dataset
     if protein_data is None:
-        # Create synthetic protein data
-        protein_data = []
-        for i in range(100):
-            protein_length = np.random.randint(50, 200)
-            protein_data.append(
-                {
-                    "id": f"protein_{i}",
-                    "primary": "".join(
-                        np.random.choice(list("ACDEFGHIKLMNPQRSTVWY"), size=protein_length)
-                    ),
-                    "protein_length": protein_length,
-                    "class_label": np.random.randint(0, 5),
-                    "fold_label": np.random.randint(0, 10),
-                    "superfamily_label": np.random.randint(0, 20),
-                    "family_label": np.random.randint(0, 50),
-                    # Synthetic residue-level features
-                    "secondary_structure": [
-                        [np.random.random(), np.random.random(), np.random.random()]
-                        for _ in range(protein_length)
-                    ],
-                    "solvent_accessibility": [
-                        [np.random.random(), np.random.random()] for _ in range(protein_length)
-                    ],
-                }
-            )
+        # Create synthetic protein data, drawing all residues and features in one call each
+        rng = np.random.default_rng(42)
+        n_proteins = 100
+        lengths = rng.integers(50, 200, size=n_proteins)
+        boundaries = np.cumsum(lengths)[:-1]
+        residues = rng.choice(
+            np.frombuffer(b"ACDEFGHIKLMNPQRSTVWY", dtype="S1"), size=lengths.sum()
+        )
 
-        protein_df = pd.DataFrame(protein_data)
+        protein_df = pd.DataFrame(
+            {
+                "id": [f"protein_{i}" for i in range(n_proteins)],
+                "primary": [chunk.tobytes().decode() for chunk in np.split(residues, boundaries)],
+                "protein_length": lengths,
+                "class_label": rng.integers(0, 5, size=n_proteins),
+                "fold_label": rng.integers(0, 10, size=n_proteins),
+                "superfamily_label": rng.integers(0, 20, size=n_proteins),
+                "family_label": rng.integers(0, 50, size=n_proteins),
+                # Synthetic residue-level features, one (length, n_features) array per protein
+                "secondary_structure": np.split(rng.random((lengths.sum(), 3)), boundaries),
+                "solvent_accessibility": np.split(rng.random((lengths.sum(), 2)), boundaries),
+            }
+        )
     else:
         protein_df = pd.DataFrame(protein_data)
 
     # Add cluster column if it doesn't exist (for testing purposes)
     if "representative_sequence" not in protein_df.columns:
         # Use a simple clustering based on protein length
-        protein_df["representative_sequence"] = protein_df["id"].copy()
+        protein_df["representative_sequence"] = protein_df["id"]
 
     # Run enhanced MILP split with protein data
     logger.info("Running enhanced MILP split with protein data")
@@ -380,9 +372,9 @@ def test_enhanced_milp_split(fluorescence_data, protein_data=None):
     assert len(train_protein_df) + len(test_protein_df) == len(protein_df)
 
     # Check that groups are preserved (no cluster appears in both splits)
-    train_groups = set(train_protein_df["representative_sequence"])
-    test_groups = set(test_protein_df["representative_sequence"])
-    assert len(train_groups.intersection(test_groups)) == 0
+    assert disjoint(
+        train_protein_df["representative_sequence"], test_protein_df["representative_sequence"]
+    )
 
     # Check approximate test size
     test_ratio = len(test_protein_df) / len(protein_df)
@@ -391,19 +383,21 @@ def test_enhanced_milp_split(fluorescence_data, protein_data=None):
     # Now test with fluorescence data if provided
     if fluorescence_data is not None:
         df = fluorescence_data.copy()
+        rng = np.random.default_rng(42)
 
         # Add some synthetic categorical columns
-        df["sequence_type"] = np.random.choice(["wild_type", "mutant", "synthetic"], size=len(df))
-        df["expression_level"] = np.random.choice(["low", "medium", "high"], size=len(df))
+        df["sequence_type"] = rng.choice(["wild_type", "mutant", "synthetic"], size=len(df))
+        df["expression_level"] = rng.choice(["low", "medium", "high"], size=len(df))
 
-        # Add some synthetic residue-level data
-        df["residue_hydrophobicity"] = [
-            np.random.normal(0, 1, size=len(seq)) for seq in df["sequence"]
-        ]
+        # Add some synthetic residue-level data: one draw for all residues, split per sequence
+        lengths = df["sequence"].str.len().to_numpy()
+        df["residue_hydrophobicity"] = np.split(
+            rng.standard_normal(lengths.sum()), np.cumsum(lengths)[:-1]
+        )
 
         # Add cluster column if it doesn't exist
         if "representative_sequence" not in df.columns:
-            df["representative_sequence"] = df["id"].copy()
+            df["representative_sequence"] = df["id"]
 
         logger.info("Running enhanced MILP split with fluorescence data")
         train_df, test_df = milp_split(
@@ -451,14 +445,11 @@ def test_enhanced_milp_split(fluorescence_data, protein_data=None):
             train_dist = train_df[cat_col].value_counts(normalize=True)
             test_dist = test_df[cat_col].value_counts(normalize=True)
 
-            # Compute Jensen-Shannon divergence (simplified)
-            all_cats = set(train_dist.index).union(set(test_dist.index))
-            js_div = 0
-            for cat in all_cats:
-                p = train_dist.get(cat, 0)
-                q = test_dist.get(cat, 0)
-                js_div += abs(p - q)
-            js_div /= 2  # Normalize
+            # Compute Jensen-Shannon divergence (simplified to total variation distance)
+            all_cats = train_dist.index.union(test_dist.index)
+            p = train_dist.reindex(all_cats, fill_value=0).to_numpy()
+            q = test_dist.reindex(all_cats, fill_value=0).to_numpy()
+            js_div = np.abs(p - q).sum() / 2
 
             logger.info(f"Categorical balance for {cat_col}:")
             logger.info(f"  Train distribution: {dict(train_dist)}")
@@ -471,12 +462,11 @@ def test_enhanced_milp_split(fluorescence_data, protein_data=None):
             )
 
         # For comparison, perform a naive split and check balance
-        from random import Random
-
-        rng = Random(42)
-        test_indices = set(rng.sample(range(len(df)), int(0.3 * len(df))))
-        naive_test = df.iloc[list(test_indices)]
-        naive_train = df.iloc[list(set(range(len(df))) - test_indices)]
+        rng = np.random.default_rng(42)
+        perm = rng.permutation(len(df))
+        n_naive_test = int(0.3 * len(df))
+        naive_test = df.iloc[perm[:n_naive_test]]
+        naive_train = df.iloc[perm[n_naive_test:]]
 
         naive_train_mean = naive_train["fluorescence"].mean()
         naive_test_mean = naive_test["fluorescence"].mean()
@@ -495,7 +485,7 @@ def test_empty_dataset_handling():
     """Test splitting functions with empty datasets."""
     import pandas as pd
 
-    from protclust import split
+    from protclust import cluster_kfold, constrained_split, milp_split, split
 
     # Create empty DataFrame with the required columns
     empty_df = pd.DataFrame(columns=["representative_sequence", "id"])
@@ -504,6 +494,19 @@ def test_empty_dataset_handling():
     train_df, test_df = split(empty_df, group_col="representative_sequence")
     assert len(train_df) == 0 and len(test_df) == 0
 
+    train_df, test_df = constrained_split(
+        empty_df, group_col="representative_sequence", id_col="id", force_train_ids=["a"]
+    )
+    assert len(train_df) == 0 and len(test_df) == 0
+
+    train_df, test_df = milp_split(empty_df, group_col="representative_sequence")
+    assert len(train_df) == 0 and len(test_df) == 0
+
+    # Empty input never reaches mmseqs, so every fold is empty
+    folds = cluster_kfold(pd.DataFrame(columns=["id", "sequence"]), "sequence", n_splits=3)
+    assert len(folds) == 3
+    assert all(len(train) == 0 and len(test) == 0 for train, test in folds)
+
 
 def test_embedder_edge_cases():
     """Test edge cases and error handling in embedders."""
@@ -531,8 +534,9 @@ def test_milp_split_categorical_handling(fluorescence_data):
     df = fluorescence_data.head(20).copy()
 
     # Add categorical columns
-    df["category"] = np.random.choice(["A", "B", "C"], size=len(df))
-    df["binary"] = np.random.choice([0, 1], size=len(df))
+    rng = np.random.default_rng(42)
+    df["category"] = rng.choice(["A", "B", "C"], size=len(df))
+    df["binary"] = rng.choice([0, 1], size=len(df))
 
     # Add cluster column simulation
     df["representative_sequence"] = df.index.astype(str)
@@ -588,3 +588,17 @@ def create_edge_case_dataset() -> pd.DataFrame:
         filtered_df["seq_length"] = filtered_df["length"]
 
     return filtered_df
+
+
+def disjoint(a: pd.Series, b: pd.Series) -> bool:
+    """
+    Check that two Series share no values, e.g. cluster labels of two splits.
+
+    Parameters:
+        a: First Series of values
+        b: Second Series of values
+
+    Returns:
+        True if no value appears in both Series
+    """
+    return np.intersect1d(a.unique(), b.unique(), assume_unique=True).size == 0